@@ -0,0 +1,16 @@
+"""
+Celery application for autocraftcv project.
+
+Workers are started with ``celery -A autocraftcv worker``; broker and routing
+settings are read from Django settings under the ``CELERY_`` prefix.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'autocraftcv.settings')
+
+app = Celery('autocraftcv')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -0,0 +1,15 @@
+"""
+URL path converters for AutoCraftCV
+"""
+
+
+class TaskIdConverter:
+    """Progress task IDs - hyphenated UUID strings or bare hex tokens"""
+    
+    regex = '[0-9a-fA-F-]{8,36}'
+    
+    def to_python(self, value):
+        return value
+    
+    def to_url(self, value):
+        return value
@@ -296,7 +296,7 @@ class CVCreationWizardView(TemplateView):
         if current_step == 5:
             # Final step completed - mark as active and redirect to profile
             user_profile.profile_status = 'active'
-            user_profile.save()
+            user_profile.save(update_fields=['profile_status', 'updated_at'])
             messages.success(request, 'Your CV has been created successfully!')
             return redirect('jobassistant:cv_profile', profile_id=user_profile.id)
         else:
@@ -5,6 +5,13 @@ from .models import (
     Project, Award, ProfessionalMembership, VolunteerWork, Publication, Reference
 )
 
+# Shared by the personal-info and comprehensive CV forms
+COUNTRY_CHOICES = (
+    ('New Zealand', 'New Zealand'),
+    ('Australia', 'Australia'),
+    ('Other', 'Other'),
+)
+
 
 class PersonalInfoForm(forms.ModelForm):
     """Form for personal information section"""
@@ -56,11 +63,7 @@ class PersonalInfoForm(forms.ModelForm):
             }),
             'country': forms.Select(attrs={
                 'class': 'form-select'
-            }, choices=[
-                ('New Zealand', 'New Zealand'),
-                ('Australia', 'Australia'),
-                ('Other', 'Other')
-            ]),
+            }, choices=COUNTRY_CHOICES),
             'postal_code': forms.TextInput(attrs={
                 'class': 'form-control',
                 'placeholder': '1010'
@@ -562,6 +565,46 @@ class ResumeUploadForm(forms.Form):
     pass
 
 
+class DocumentGenerationForm(forms.Form):
+    """Options for generating documents from the current job and profile"""
+
+    DOCUMENT_CHOICES = [
+        ('cover_letter', 'Cover Letter'),
+        ('resume', 'Tailored Resume'),
+        ('both', 'Both Cover Letter and Resume'),
+    ]
+
+    OUTPUT_FORMAT_CHOICES = [
+        ('pdf', 'PDF'),
+        ('docx', 'Word Document'),
+        ('both', 'Both PDF and Word'),
+    ]
+
+    document_type = forms.ChoiceField(
+        choices=DOCUMENT_CHOICES,
+        widget=forms.RadioSelect(attrs={'class': 'form-check-input'}),
+        initial='cover_letter',
+        label='What would you like to generate?'
+    )
+
+    output_format = forms.ChoiceField(
+        choices=OUTPUT_FORMAT_CHOICES,
+        widget=forms.RadioSelect(attrs={'class': 'form-check-input'}),
+        initial='pdf',
+        label='Output format'
+    )
+
+    custom_instructions = forms.CharField(
+        widget=forms.Textarea(attrs={
+            'class': 'form-control',
+            'rows': 3,
+            'placeholder': 'Any specific instructions or points you want to emphasize? (optional)'
+        }),
+        required=False,
+        label='Custom Instructions (Optional)'
+    )
+
+
 class ComprehensiveCVForm(forms.ModelForm):
     """Comprehensive form for editing all UserProfile fields in CV edit view"""
     
@@ -590,7 +633,7 @@ class ComprehensiveCVForm(forms.ModelForm):
             'address_line_2': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Apartment, suite, etc. (optional)'}),
             'city': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Auckland'}),
             'state_region': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Auckland Region'}),
-            'country': forms.Select(attrs={'class': 'form-select'}, choices=[('New Zealand', 'New Zealand'), ('Australia', 'Australia'), ('Other', 'Other')]),
+            'country': forms.Select(attrs={'class': 'form-select'}, choices=COUNTRY_CHOICES),
             'postal_code': forms.TextInput(attrs={'class': 'form-control', 'placeholder': '1010'}),
             'linkedin_url': forms.URLInput(attrs={'class': 'form-control', 'placeholder': 'https://linkedin.com/in/yourprofile'}),
             'portfolio_url': forms.URLInput(attrs={'class': 'form-control', 'placeholder': 'https://yourportfolio.com'}),
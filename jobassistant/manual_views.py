@@ -32,18 +32,23 @@ def manual_job_entry(request):
         failed_url = request.GET.get('url', '')
         failed_reason = request.GET.get('reason', 'Automatic scraping failed')
         
-        context = {
-            'failed_url': failed_url,
-            'failed_reason': failed_reason,
-            'page_title': 'Manual Job Entry Required'
-        }
-        
-        return render(request, 'jobassistant/manual_job_entry.html', context)
+        return render_manual_job_entry(request, failed_url, failed_reason)
     
     elif request.method == 'POST':
         return handle_manual_job_submission(request)
 
 
+def render_manual_job_entry(request, failed_url, failed_reason='Automatic scraping failed'):
+    """Render the manual entry page - also used by scrape_job_url to skip a redirect"""
+    context = {
+        'failed_url': failed_url,
+        'failed_reason': failed_reason,
+        'page_title': 'Manual Job Entry Required'
+    }
+    
+    return render(request, 'jobassistant/manual_job_entry.html', context)
+
+
 def handle_manual_job_submission(request):
     """Handle manual job content submission and AI parsing"""
     
@@ -309,22 +314,25 @@ def enhanced_manual_job_entry(request):
     failed_reason = request.GET.get('reason', 'Automatic scraping failed')
     
     if request.method == 'GET':
-        form = ManualJobEntryForm()
-        
-        context = {
-            'form': form,
-            'failed_url': failed_url,
-            'failed_reason': failed_reason,
-            'is_linkedin': 'linkedin.com' in failed_url.lower(),
-            'page_title': 'Manual Job Entry Options'
-        }
-        
-        return render(request, 'jobassistant/enhanced_manual_entry.html', context)
+        return render_enhanced_manual_entry(request, failed_url, failed_reason)
     
     elif request.method == 'POST':
         return handle_structured_manual_entry(request)
 
 
+def render_enhanced_manual_entry(request, failed_url, failed_reason='Automatic scraping failed'):
+    """Render the enhanced manual entry options - also used by scrape_job_url to skip a redirect"""
+    context = {
+        'form': ManualJobEntryForm(),
+        'failed_url': failed_url,
+        'failed_reason': failed_reason,
+        'is_linkedin': 'linkedin.com' in failed_url.lower(),
+        'page_title': 'Manual Job Entry Options'
+    }
+    
+    return render(request, 'jobassistant/enhanced_manual_entry.html', context)
+
+
 def handle_structured_manual_entry(request):
     """Handle structured manual job entry form submission"""
     
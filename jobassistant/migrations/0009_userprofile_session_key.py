@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobassistant', '0008_userprofile_profile_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='session_key',
+            field=models.CharField(blank=True, db_index=True, max_length=40),
+        ),
+    ]
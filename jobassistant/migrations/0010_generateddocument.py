@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:25
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobassistant', '0009_userprofile_session_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeneratedDocument',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('document_type', models.CharField(choices=[('cover_letter', 'Cover Letter'), ('resume', 'Tailored Resume')], max_length=20)),
+                ('generation_method', models.CharField(max_length=20)),
+                ('content', models.TextField()),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('pdf_file', models.FileField(blank=True, null=True, upload_to='generated/pdf/')),
+                ('docx_file', models.FileField(blank=True, null=True, upload_to='generated/docx/')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('generation_time', models.FloatField(blank=True, null=True)),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='generated_documents', to='jobassistant.jobposting')),
+                ('user_profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='generated_documents', to='jobassistant.userprofile')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
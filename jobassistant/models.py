@@ -71,7 +71,7 @@ class UserProfile(models.Model):
     # Primary Key and User Association
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
-    session_key = models.CharField(max_length=40, blank=True)  # For anonymous users
+    session_key = models.CharField(max_length=40, blank=True, db_index=True)  # For anonymous users
     
     # Section 1: Personal Information
     first_name = models.CharField(max_length=100, default='')
@@ -466,6 +466,40 @@ class JobPosting(models.Model):
         return f"{title} at {company}"
 
 
+class GeneratedDocument(models.Model):
+    """Cover letters and resumes generated for a profile and job posting"""
+    
+    DOCUMENT_TYPES = [
+        ('cover_letter', 'Cover Letter'),
+        ('resume', 'Tailored Resume'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user_profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='generated_documents')
+    job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='generated_documents')
+    
+    document_type = models.CharField(max_length=20, choices=DOCUMENT_TYPES)
+    generation_method = models.CharField(max_length=20)
+    
+    # Content
+    content = models.TextField()
+    title = models.CharField(max_length=200, blank=True)
+    
+    # Rendered by generate_document_files_task after the row is saved
+    pdf_file = models.FileField(upload_to='generated/pdf/', blank=True, null=True)
+    docx_file = models.FileField(upload_to='generated/docx/', blank=True, null=True)
+    
+    # Metadata
+    created_at = models.DateTimeField(default=timezone.now)
+    generation_time = models.FloatField(null=True, blank=True)  # seconds
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.get_document_type_display()} - {self.title}"
+
+
 class ProgressTask(models.Model):
     """Model to track progress of CV parsing and generation tasks"""
     task_id = models.CharField(max_length=36, primary_key=True)  # UUID as string
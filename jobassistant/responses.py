@@ -0,0 +1,15 @@
+"""
+HTTP response helpers for AutoCraftCV
+"""
+
+import orjson
+from django.http import HttpResponse
+
+
+class ORJSONResponse(HttpResponse):
+    """Drop-in replacement for JsonResponse that serializes with orjson"""
+    
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        # default=str covers Decimal and lazy translation strings, as DjangoJSONEncoder would
+        super().__init__(orjson.dumps(data, default=str), **kwargs)
@@ -3,7 +3,145 @@ Utility functions for safe job data handling and database operations
 """
 
 import re
-from typing import Dict, Any, Optional
+import soupsieve
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse
+
+try:
+    import ahocorasick
+except ImportError as exc:
+    raise ImportError(
+        "Couldn't import ahocorasick, which jobassistant.safe_data_utils needs "
+        "for location extraction. Install the 'pyahocorasick' package "
+        "(pip install -r requirements.txt)."
+    ) from exc
+
+try:
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.common.by import By
+    _BY_CSS = By.CSS_SELECTOR
+except ImportError:  # Selenium is only needed when a driver is passed in
+    WebDriverException = Exception
+    _BY_CSS = 'css selector'
+
+
+# CSS selectors for Strategy 1, in priority order (:-soup-contains only works with BeautifulSoup)
+_LOCATION_SELECTORS = (
+    '[data-test="job-location"]',
+    '.jobs-unified-top-card__bullet',
+    '.job-criteria__text',
+    '.jobs-details-top-card__bullet',
+    '.jobs-unified-top-card__primary-description',
+    '.job-details-top-card__job-insight',
+    'span:-soup-contains("Australia")',
+    'span:-soup-contains("Sydney")',
+    'span:-soup-contains("Melbourne")',
+    'span:-soup-contains("Brisbane")',
+    'span:-soup-contains("Perth")',
+    'span:-soup-contains("Adelaide")',
+)
+_COMPILED_LOCATION_SELECTORS = tuple(soupsieve.compile(selector) for selector in _LOCATION_SELECTORS)
+_LOCATION_SELECTOR_UNION = soupsieve.compile(', '.join(_LOCATION_SELECTORS))
+# Browsers reject the soupsieve-only pseudo-class, so Selenium skips those entries
+_SELENIUM_LOCATION_SELECTORS = tuple(selector for selector in _LOCATION_SELECTORS if ':-soup-contains' not in selector)
+
+# Location patterns for enhance_location_extraction, compiled once, in priority
+# order. Each is scanned on its own: in a single alternation a long match from
+# one branch that then fails validation would hide hits of later branches nested
+# inside it (e.g. "Sydney" inside a rejected "... Engineer QLD" span)
+_LOCATION_PATTERNS = (
+    # Australian cities with state/country. States are grouped by first letter so
+    # a non-matching character rejects a whole group at once, most common first;
+    # within a group the abbreviation stays ahead of the name it prefixes
+    # (VIC/Victoria, TAS/Tasmania, Australia/Australian...) to keep the same match
+    re.compile(
+        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*'
+        r'(?:N(?:SW|T|ew South Wales|orthern Territory)|V(?:IC|ictoria)|Q(?:LD|ueensland)'
+        r'|A(?:ustralia|CT|ustralian Capital Territory)|W(?:A|estern Australia)'
+        r'|S(?:A|outh Australia)|T(?:AS|asmania)))',
+        re.IGNORECASE
+    ),
+    # Major Australian cities
+    re.compile(
+        r'(Sydney|Melbourne|Brisbane|Perth|Adelaide|Darwin|Hobart|Canberra)(?:\s*,\s*(?:Australia|NSW|QLD|VIC|WA|SA|TAS|NT|ACT))?',
+        re.IGNORECASE
+    ),
+    # Work arrangements
+    re.compile(r'(Remote|Hybrid|Work from home)', re.IGNORECASE),
+    # "X City, State"
+    re.compile(r'([A-Z][a-z]+\s+City,\s*[A-Z][a-z]+)', re.IGNORECASE),
+)
+
+# Catch-all "Place, Place" - scanned last
+_GENERIC_LOCATION_RE = re.compile(
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*,\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
+    re.IGNORECASE
+)
+
+# Capitalized word run - pulls a place name out of indicator context
+_CAPWORD_RE = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)')
+
+# Location indicators for Strategy 3, in priority order
+_LOCATION_INDICATORS = (
+    'brisbane', 'sydney', 'melbourne', 'perth', 'adelaide', 'darwin', 'hobart', 'canberra',
+    'queensland', 'new south wales', 'victoria', 'western australia', 'south australia',
+    'tasmania', 'northern territory', 'australian capital territory',
+    'nsw', 'qld', 'vic', 'wa', 'sa', 'tas', 'nt', 'act'
+)
+
+
+def _build_automaton(words) -> 'ahocorasick.Automaton':
+    """Build an Aho-Corasick automaton that yields each matched word"""
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
+_LOCATION_AUTOMATON = _build_automaton(_LOCATION_INDICATORS)
+
+# Shapes accepted by is_valid_location
+_PROPER_CASE_RE = re.compile(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$')  # Proper case city names
+_CITY_COMMA_STATE_RE = re.compile(r'[A-Z][a-z]+,\s*[A-Z]')  # City, State format
+_WORK_ARRANGEMENT_VALID_RE = re.compile(r'(remote|hybrid|work from home)', re.IGNORECASE)  # Work arrangements
+_VALID_LOCATION_PATTERNS = (
+    _PROPER_CASE_RE,
+    _CITY_COMMA_STATE_RE,
+    _WORK_ARRANGEMENT_VALID_RE,
+)
+
+# Substrings that rule a candidate out / mark it as Australian - one search each
+_INVALID_INDICATORS = (
+    'apply', 'job', 'save', 'share', 'view', 'click', 'button', 'link',
+    'full-time', 'part-time', 'contract', 'salary', 'benefits', 'description',
+    'requirements', 'qualifications', 'experience', 'skills', 'years',
+    'degree', 'education', 'certification', 'training', 'software',
+    'developer', 'engineer', 'manager', 'analyst', 'specialist',
+    'follow', 'connect', 'message', 'post', 'profile', 'company'
+)
+_AUSTRALIAN_INDICATORS = (
+    'australia', 'sydney', 'melbourne', 'brisbane', 'perth', 'adelaide',
+    'queensland', 'nsw', 'vic', 'wa', 'sa', 'tas', 'nt', 'act',
+    'city', 'suburb', 'metro', 'cbd'
+)
+_INVALID_INDICATOR_RE = re.compile('|'.join(map(re.escape, _INVALID_INDICATORS)))
+_AU_INDICATOR_RE = re.compile('|'.join(map(re.escape, _AUSTRALIAN_INDICATORS)))
+
+# Netloc of an http(s) URL - same result as urlparse(url).netloc for these
+# (bracketed IPv6 hosts and whitespace are left to urlparse)
+_DOMAIN_RE = re.compile(r'https?://([^/?#\[\]\s]+)(?=[/?#]|$)', re.IGNORECASE)
+
+# Keys scrapers use for salary, in preference order
+_SALARY_FIELDS = ('salary', 'salary_range', 'salary_info')
+
+# Stringified placeholders that count as a missing value
+_SENTINEL_VALUES = frozenset((
+    'none', 'null', 'undefined',
+    'None', 'Null', 'Undefined',
+    'NONE', 'NULL', 'UNDEFINED'
+))
 
 
 def clean_job_data(raw_data: Dict[str, Any], job_url: str) -> Dict[str, Any]:
@@ -14,62 +152,54 @@ def clean_job_data(raw_data: Dict[str, Any], job_url: str) -> Dict[str, Any]:
     
     # Extract and clean each field with safe defaults
     cleaned = {
-        'title': safe_extract_field(raw_data, 'title', 'Job Title Not Available'),
-        'company': safe_extract_field(raw_data, 'company', 'Company Not Available'),
-        'location': safe_extract_field(raw_data, 'location', 'Location Not Available'),
-        'description': safe_extract_field(raw_data, 'description', 'Job description not extracted'),
-        'requirements': safe_extract_field(raw_data, 'requirements', ''),
-        'qualifications': safe_extract_field(raw_data, 'qualifications', ''),
-        'responsibilities': safe_extract_field(raw_data, 'responsibilities', ''),
-        'salary_range': safe_extract_field(raw_data, ['salary', 'salary_range', 'salary_info'], ''),
-        'employment_type': safe_extract_field(raw_data, 'employment_type', ''),
-        'application_instructions': safe_extract_field(raw_data, 'application_instructions', ''),
-        'raw_content': safe_extract_field(raw_data, 'raw_content', ''),
-        'scraping_method': safe_extract_field(raw_data, 'scraping_method', 'enhanced_scraping'),
-        'extraction_method': safe_extract_field(raw_data, 'extraction_method', 'standard'),
+        'title': safe_extract_field(raw_data, ('title',), 'Job Title Not Available', min_len=3),
+        'company': safe_extract_field(raw_data, ('company',), 'Company Not Available', min_len=2),
+        'location': safe_extract_field(raw_data, ('location',), 'Location Not Available', min_len=2),
+        'description': safe_extract_field(raw_data, ('description',), 'Job description not extracted'),
+        'requirements': safe_extract_field(raw_data, ('requirements',), ''),
+        'qualifications': safe_extract_field(raw_data, ('qualifications',), ''),
+        'responsibilities': safe_extract_field(raw_data, ('responsibilities',), ''),
+        'salary_range': safe_extract_field(raw_data, _SALARY_FIELDS, ''),
+        'employment_type': safe_extract_field(raw_data, ('employment_type',), ''),
+        'application_instructions': safe_extract_field(raw_data, ('application_instructions',), ''),
+        'raw_content': safe_extract_field(raw_data, ('raw_content',), ''),
+        'scraping_method': safe_extract_field(raw_data, ('scraping_method',), 'enhanced_scraping'),
+        'extraction_method': safe_extract_field(raw_data, ('extraction_method',), 'standard'),
         'site_domain': extract_domain_from_url(job_url),
-        'needs_review': raw_data.get('needs_review', False)
+        # The only field that can still come through as None
+        'needs_review': raw_data.get('needs_review') or False
     }
     
-    # Additional validation to ensure no None values
-    for key, value in cleaned.items():
-        if value is None:
-            if key in ['title', 'company', 'location']:
-                cleaned[key] = f'{key.replace("_", " ").title()} Not Available'
-            else:
-                cleaned[key] = ''
-    
-    # Validate critical fields
-    validate_critical_fields(cleaned)
-    
     return cleaned
 
 
-def safe_extract_field(raw_data: Dict[str, Any], field_names: Any, default_value: str = '') -> str:
+def safe_extract_field(raw_data: Dict[str, Any], field_names: Any, default_value: str = '', min_len: int = 1) -> str:
     """
     Safely extract a field from raw data with multiple possible field names.
-    Returns default_value if field is missing, None, or empty.
+    Returns default_value if field is missing, None, or shorter than min_len.
     """
     
-    # Handle single field name or list of field names
-    if isinstance(field_names, str):
-        field_names = [field_names]
+    # Callers pass a tuple of field names; a bare name is still accepted
+    if type(field_names) is str:
+        field_names = (field_names,)
     
     # Try each field name
     for field_name in field_names:
+        # get() already folds missing keys and explicit None into one check
         value = raw_data.get(field_name)
+        if value is None:
+            continue
         
-        if value is not None:
-            # Clean the value
-            if isinstance(value, str):
-                cleaned_value = value.strip()
-                if cleaned_value:  # Not empty after stripping
-                    return cleaned_value
-            else:
-                # Non-string value, convert to string
-                str_value = str(value).strip()
-                if str_value and str_value.lower() not in ['none', 'null', 'undefined']:
-                    return str_value
+        # Clean the value
+        try:
+            cleaned_value = value.strip()
+        except AttributeError:
+            # Non-string value, convert to string
+            cleaned_value = str(value).strip()
+            if cleaned_value in _SENTINEL_VALUES:
+                continue
+        if len(cleaned_value) >= min_len:  # Long enough after stripping
+            return cleaned_value
     
     # No valid value found, return default
     return default_value
@@ -77,40 +207,141 @@ def safe_extract_field(raw_data: Dict[str, Any], field_names: Any, default_value
 
 def validate_critical_fields(cleaned_data: Dict[str, Any]) -> None:
     """
-    Validate that critical fields meet minimum requirements.
+    Validate fields that cannot be defaulted.
+    Title, company and location minimums are enforced by safe_extract_field's min_len.
     Raises ValueError if validation fails.
     """
     
-    # Ensure title is meaningful
-    title = cleaned_data.get('title', '')
-    if not title or len(title.strip()) < 3:
-        cleaned_data['title'] = 'Job Title Not Available'
-    
-    # Ensure company is meaningful
-    company = cleaned_data.get('company', '')
-    if not company or len(company.strip()) < 2:
-        cleaned_data['company'] = 'Company Not Available'
-    
-    # Ensure location exists (key fix for constraint error)
-    location = cleaned_data.get('location', '')
-    if not location or len(location.strip()) < 2:
-        cleaned_data['location'] = 'Location Not Available'
-    
     # Validate URL exists
     if 'url' in cleaned_data and not cleaned_data['url']:
         raise ValueError("Job URL is required")
 
 
+@lru_cache(maxsize=2048)
 def extract_domain_from_url(url: str) -> str:
-    """Extract domain from URL for site_domain field"""
+    """Extract domain from URL for site_domain field (memoized - batches share domains)"""
+    # Plain http(s) URLs don't need the full parser; anything else (including a
+    # missing URL) goes through urlparse exactly as before
+    if isinstance(url, str):
+        match = _DOMAIN_RE.match(url)
+        if match:
+            return match.group(1).lower()
     try:
-        from urllib.parse import urlparse
         parsed = urlparse(url)
         return parsed.netloc.lower()
-    except:
+    except ValueError:
         return 'unknown'
 
 
+def extract_domains_from_urls(urls: List[str]) -> List[str]:
+    """Extract site domains for a batch of scraped URLs"""
+    return [extract_domain_from_url(url) for url in urls]
+
+
+def enhance_location_extraction(page_text: str, soup=None, driver=None) -> str:
+    """
+    Enhanced location extraction with multiple fallback strategies.
+    Specifically designed to prevent location NOT NULL constraint errors.
+    """
+    
+    # Strategy 1: CSS selectors for location (if soup or driver available)
+    if driver:  # Selenium
+        for selector in _SELENIUM_LOCATION_SELECTORS:
+            try:
+                # find_elements returns [] on no match instead of raising
+                elements = driver.find_elements(_BY_CSS, selector)
+                location_text = elements[0].text.strip() if elements else ''
+            except WebDriverException:  # e.g. element went stale mid-read
+                continue
+            
+            if location_text and is_valid_location(location_text):
+                return location_text
+    elif soup:  # BeautifulSoup
+        # One traversal collects every candidate; selectors are then tried in
+        # priority order against that short list instead of re-walking the tree
+        candidates = _LOCATION_SELECTOR_UNION.select(soup)
+        for selector in _COMPILED_LOCATION_SELECTORS:
+            element = next((candidate for candidate in candidates if selector.match(candidate)), None)
+            location_text = element.get_text().strip() if element else ''
+            
+            if location_text and is_valid_location(location_text):
+                return location_text
+    
+    # Strategy 2: Text pattern matching for Australian locations
+    if page_text:
+        for pattern in _LOCATION_PATTERNS:
+            for match in pattern.finditer(page_text):
+                location_text = match.group(1).strip()
+                if is_valid_location(location_text):
+                    return location_text
+        
+        for match in _GENERIC_LOCATION_RE.finditer(page_text):
+            location_text = match.group(1).strip()
+            if is_valid_location(location_text):
+                return location_text
+        
+        # Strategy 3: Look for common location indicators - the lowered copy of the
+        # page is only made once the cheaper strategies have come up empty
+        page_lower = page_text.lower()
+        
+        # One Aho-Corasick pass records the context window around each indicator's
+        # first appearance, straight from the match end offset
+        text_length = len(page_text)
+        windows = {}
+        for end_index, indicator in _LOCATION_AUTOMATON.iter(page_lower):
+            if indicator not in windows:
+                windows[indicator] = (
+                    max(0, end_index + 1 - len(indicator) - 50),
+                    min(text_length, end_index + 1 + 50)
+                )
+        
+        for indicator in _LOCATION_INDICATORS:
+            if indicator in windows:
+                # Look for location pattern in the surrounding context - pos/endpos
+                # bound the search without slicing out a copy
+                start, end = windows[indicator]
+                location_match = _CAPWORD_RE.search(page_text, start, end)
+                if location_match:
+                    potential_location = location_match.group(1).strip()
+                    if is_valid_location(potential_location):
+                        return potential_location
+    
+    # Strategy 4: Return safe default (prevents NOT NULL constraint error)
+    return 'Location Not Available'
+
+
+def is_valid_location(text: str) -> bool:
+    """
+    Check if extracted text looks like a valid location.
+    Helps prevent false positives in location extraction.
+    """
+    if not text or len(text.strip()) < 2:
+        return False
+    
+    text_clean = text.strip()
+    
+    # Skip if too long (likely not a location)
+    if len(text_clean) > 100:
+        return False
+    
+    # Skip obvious non-location text
+    text_lower = text_clean.lower()
+    if _INVALID_INDICATOR_RE.search(text_lower):
+        return False
+    
+    # Check for valid location patterns
+    for pattern in _VALID_LOCATION_PATTERNS:
+        if pattern.match(text_clean):
+            return True
+    
+    # Additional validation for Australian locations
+    if _AU_INDICATOR_RE.search(text_lower):
+        return True
+    
+    # If it passes basic checks and isn't obviously invalid, accept it
+    return len(text_clean) >= 3 and len(text_clean) <= 50
+
+
 def get_safe_job_data_for_save(job_data: Dict[str, Any], job_url: str, method_used: str) -> Dict[str, Any]:
     """
     Prepare job data for safe database save, ensuring all NOT NULL constraints are satisfied.
@@ -124,17 +355,7 @@ def get_safe_job_data_for_save(job_data: Dict[str, Any], job_url: str, method_us
     # Clean and validate all data
     cleaned_data = clean_job_data(job_data, job_url)
     
-    # Add URL
-    cleaned_data['url'] = job_url
-    
-    # Final safety check - ensure no None values
-    for key, value in cleaned_data.items():
-        if value is None:
-            if key in ['title', 'company', 'location']:
-                cleaned_data[key] = f'{key.replace("_", " ").title()} Not Available'
-            elif isinstance(value, bool):
-                cleaned_data[key] = False
-            else:
-                cleaned_data[key] = ''
+    # Add URL (every other field is already guaranteed non-None)
+    cleaned_data['url'] = job_url or ''
     
     return cleaned_data
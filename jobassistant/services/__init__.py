@@ -1 +1,45 @@
-# Empty file to make services a Python package
+# Services package - shared, lazily constructed service instances
+
+from functools import lru_cache
+
+
+# One instance per process (and per free/paid mode) so HTTP sessions, API clients
+# and PDF styles are built once and their connection pools survive across requests.
+# Imports stay inside the builders so loading this package stays cheap.
+# The accessors normalise the mode first: lru_cache keys on how it was called, so
+# get_scraper() and get_scraper(False) would otherwise build two free instances.
+
+@lru_cache(maxsize=2)
+def _build_scraper(use_paid: bool):
+    from .scraping_service import JobScrapingService
+    return JobScrapingService(use_paid_apis=use_paid)
+
+
+@lru_cache(maxsize=2)
+def _build_resume_parser(use_paid: bool):
+    from .parsing_service import ResumeParsingService
+    return ResumeParsingService(use_paid_apis=use_paid)
+
+
+@lru_cache(maxsize=2)
+def _build_content_generator(use_paid: bool):
+    from .content_generation_service import ContentGenerationService
+    return ContentGenerationService(use_paid_apis=use_paid)
+
+
+def get_scraper(use_paid: bool = False):
+    return _build_scraper(bool(use_paid))
+
+
+def get_resume_parser(use_paid: bool = False):
+    return _build_resume_parser(bool(use_paid))
+
+
+def get_content_generator(use_paid: bool = False):
+    return _build_content_generator(bool(use_paid))
+
+
+@lru_cache(maxsize=1)
+def get_document_generator():
+    from .document_generation_service import DocumentGenerationService
+    return DocumentGenerationService()
@@ -3,6 +3,7 @@ Enhanced Job Scraping Service with Multiple Strategies and Robust Error Handling
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import time
 import re
@@ -34,6 +35,12 @@ class EnhancedJobScrapingService:
     
     def setup_session(self):
         """Setup session with realistic headers and settings"""
+        # Pool keep-alive connections so repeat scrapes of the same job board skip
+        # the TCP/TLS handshake; retries stay in _fetch_page_content
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Rotate user agents to avoid detection
         user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -3,14 +3,14 @@ Enhanced Job scraping service with multiple strategies and anti-detection capabi
 """
 
 import requests
+import soupsieve
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-import time
+from selenium.common.exceptions import TimeoutException
 import re
 from typing import Dict, Optional, Tuple
 from django.conf import settings
@@ -22,6 +22,111 @@ from .linkedin_scraper import LinkedInJobScraper
 logger = logging.getLogger(__name__)
 
 
+def _compile_selectors(*selectors: str) -> Tuple:
+    """Compile CSS selectors once at import time; order is the lookup priority"""
+    return tuple(soupsieve.compile(selector) for selector in selectors)
+
+
+LINKEDIN_SELECTORS = {
+    'title': _compile_selectors(
+        'h1.t-24.t-bold.inline',
+        'h1[data-automation-id="jobPostingHeader"]',
+        '.job-details-jobs-unified-top-card__job-title',
+        'h1.job-title',
+    ),
+    'company': _compile_selectors(
+        '.job-details-jobs-unified-top-card__company-name',
+        '.jobs-unified-top-card__company-name',
+        'a[data-automation-id="jobPostingCompanyLink"]',
+        '.company-name',
+    ),
+    'location': _compile_selectors(
+        '.job-details-jobs-unified-top-card__bullet',
+        '.jobs-unified-top-card__bullet',
+        '[data-automation-id="jobPostingLocation"]',
+    ),
+    'description': _compile_selectors(
+        '.jobs-description-content__text',
+        '.jobs-box__html-content',
+        '.description-content',
+    ),
+}
+
+INDEED_SELECTORS = {
+    'title': _compile_selectors(
+        'h1[data-testid="jobsearch-JobInfoHeader-title"]',
+        'h1.jobsearch-JobInfoHeader-title',
+        '.jobsearch-JobInfoHeader-title',
+    ),
+    'company': _compile_selectors(
+        '[data-testid="inlineHeader-companyName"]',
+        '.jobsearch-InlineCompanyRating',
+        '.jobsearch-JobInfoHeader-subtitle',
+    ),
+    'location': _compile_selectors(
+        '[data-testid="job-location"]',
+        '.jobsearch-JobInfoHeader-subtitle',
+    ),
+    'description': _compile_selectors(
+        '#jobDescriptionText',
+        '.jobsearch-jobDescriptionText',
+        '.job-description',
+    ),
+}
+
+GLASSDOOR_SELECTORS = {
+    'title': _compile_selectors(
+        '[data-test="job-title"]',
+        '.jobTitle',
+        'h1',
+    ),
+    'company': _compile_selectors(
+        '[data-test="employer-name"]',
+        '.employerName',
+        '.company',
+    ),
+    'location': _compile_selectors(
+        '[data-test="job-location"]',
+        '.location',
+    ),
+    'description': _compile_selectors(
+        '[data-test="jobDescriptionContent"]',
+        '.jobDescriptionContent',
+        '.job-description',
+    ),
+}
+
+# Generic fallback - h1 or elements with job/title/company keywords, large text blocks
+GENERIC_SELECTORS = {
+    'title': _compile_selectors(
+        'h1',
+        '[class*="title"]',
+        '[class*="job-title"]',
+        '[id*="title"]',
+        '[id*="job-title"]',
+    ),
+    'company': _compile_selectors(
+        '[class*="company"]',
+        '[id*="company"]',
+        '[class*="employer"]',
+        '[id*="employer"]',
+    ),
+    'location': _compile_selectors(
+        '[class*="location"]',
+        '[id*="location"]',
+        '[class*="address"]',
+    ),
+    'description': _compile_selectors(
+        '[class*="description"]',
+        '[id*="description"]',
+        '[class*="content"]',
+        '.job-content',
+        'main',
+        'article',
+    ),
+}
+
+
 class JobScrapingService:
     """Enhanced service for scraping job postings from various websites with anti-detection"""
     
@@ -294,10 +399,11 @@ class JobScrapingService:
     def _scrape_with_selenium(self, url: str) -> Dict:
         """Scrape using Selenium WebDriver"""
         chrome_options = Options()
-        chrome_options.add_argument('--headless')
+        # Return from driver.get() at DOMContentLoaded instead of waiting on images/trackers
+        chrome_options.page_load_strategy = 'eager'
+        chrome_options.add_argument('--headless=new')
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--window-size=1920,1080')
         
         driver = None
@@ -305,13 +411,15 @@ class JobScrapingService:
             driver = webdriver.Chrome(options=chrome_options)
             driver.get(url)
             
-            # Wait for page to load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Additional wait for dynamic content
-            time.sleep(3)
+            # Wait for the job title to render rather than sleeping a fixed interval
+            try:
+                WebDriverWait(driver, 8).until(
+                    EC.presence_of_element_located(
+                        (By.CSS_SELECTOR, 'h1, [data-test="job-title"]')
+                    )
+                )
+            except TimeoutException:
+                logger.debug(f"Job title not found within wait window for {url}, parsing what loaded")
             
             soup = BeautifulSoup(driver.page_source, 'html.parser')
             return self._parse_job_content(soup, url)
@@ -335,166 +443,32 @@ class JobScrapingService:
     
     def _parse_linkedin_job(self, soup: BeautifulSoup) -> Dict:
         """Parse LinkedIn job posting"""
-        job_data = {}
-        
-        # Title
-        title_selectors = [
-            'h1.t-24.t-bold.inline',
-            'h1[data-automation-id="jobPostingHeader"]',
-            '.job-details-jobs-unified-top-card__job-title',
-            'h1.job-title'
-        ]
-        job_data['title'] = self._extract_text_by_selectors(soup, title_selectors)
-        
-        # Company
-        company_selectors = [
-            '.job-details-jobs-unified-top-card__company-name',
-            '.jobs-unified-top-card__company-name',
-            'a[data-automation-id="jobPostingCompanyLink"]',
-            '.company-name'
-        ]
-        job_data['company'] = self._extract_text_by_selectors(soup, company_selectors)
-        
-        # Location
-        location_selectors = [
-            '.job-details-jobs-unified-top-card__bullet',
-            '.jobs-unified-top-card__bullet',
-            '[data-automation-id="jobPostingLocation"]'
-        ]
-        job_data['location'] = self._extract_text_by_selectors(soup, location_selectors)
-        
-        # Description
-        description_selectors = [
-            '.jobs-description-content__text',
-            '.jobs-box__html-content',
-            '.description-content'
-        ]
-        job_data['description'] = self._extract_text_by_selectors(soup, description_selectors)
-        
-        return self._extract_additional_info(job_data, soup)
+        return self._parse_with_selectors(soup, LINKEDIN_SELECTORS)
     
     def _parse_indeed_job(self, soup: BeautifulSoup) -> Dict:
         """Parse Indeed job posting"""
-        job_data = {}
-        
-        # Title
-        title_selectors = [
-            'h1[data-testid="jobsearch-JobInfoHeader-title"]',
-            'h1.jobsearch-JobInfoHeader-title',
-            '.jobsearch-JobInfoHeader-title'
-        ]
-        job_data['title'] = self._extract_text_by_selectors(soup, title_selectors)
-        
-        # Company
-        company_selectors = [
-            '[data-testid="inlineHeader-companyName"]',
-            '.jobsearch-InlineCompanyRating',
-            '.jobsearch-JobInfoHeader-subtitle'
-        ]
-        job_data['company'] = self._extract_text_by_selectors(soup, company_selectors)
-        
-        # Location
-        location_selectors = [
-            '[data-testid="job-location"]',
-            '.jobsearch-JobInfoHeader-subtitle'
-        ]
-        job_data['location'] = self._extract_text_by_selectors(soup, location_selectors)
-        
-        # Description
-        description_selectors = [
-            '#jobDescriptionText',
-            '.jobsearch-jobDescriptionText',
-            '.job-description'
-        ]
-        job_data['description'] = self._extract_text_by_selectors(soup, description_selectors)
-        
-        return self._extract_additional_info(job_data, soup)
+        return self._parse_with_selectors(soup, INDEED_SELECTORS)
     
     def _parse_glassdoor_job(self, soup: BeautifulSoup) -> Dict:
         """Parse Glassdoor job posting"""
-        job_data = {}
-        
-        # Title
-        title_selectors = [
-            '[data-test="job-title"]',
-            '.jobTitle',
-            'h1'
-        ]
-        job_data['title'] = self._extract_text_by_selectors(soup, title_selectors)
-        
-        # Company
-        company_selectors = [
-            '[data-test="employer-name"]',
-            '.employerName',
-            '.company'
-        ]
-        job_data['company'] = self._extract_text_by_selectors(soup, company_selectors)
-        
-        # Location
-        location_selectors = [
-            '[data-test="job-location"]',
-            '.location'
-        ]
-        job_data['location'] = self._extract_text_by_selectors(soup, location_selectors)
-        
-        # Description
-        description_selectors = [
-            '[data-test="jobDescriptionContent"]',
-            '.jobDescriptionContent',
-            '.job-description'
-        ]
-        job_data['description'] = self._extract_text_by_selectors(soup, description_selectors)
-        
-        return self._extract_additional_info(job_data, soup)
+        return self._parse_with_selectors(soup, GLASSDOOR_SELECTORS)
     
     def _parse_generic_job(self, soup: BeautifulSoup) -> Dict:
         """Parse generic job posting using common patterns"""
-        job_data = {}
-        
-        # Title - look for h1 or elements with job/title keywords
-        title_selectors = [
-            'h1',
-            '[class*="title"]',
-            '[class*="job-title"]',
-            '[id*="title"]',
-            '[id*="job-title"]'
-        ]
-        job_data['title'] = self._extract_text_by_selectors(soup, title_selectors)
-        
-        # Company - look for elements with company keywords
-        company_selectors = [
-            '[class*="company"]',
-            '[id*="company"]',
-            '[class*="employer"]',
-            '[id*="employer"]'
-        ]
-        job_data['company'] = self._extract_text_by_selectors(soup, company_selectors)
-        
-        # Location
-        location_selectors = [
-            '[class*="location"]',
-            '[id*="location"]',
-            '[class*="address"]'
-        ]
-        job_data['location'] = self._extract_text_by_selectors(soup, location_selectors)
-        
-        # Description - look for large text blocks
-        description_selectors = [
-            '[class*="description"]',
-            '[id*="description"]',
-            '[class*="content"]',
-            '.job-content',
-            'main',
-            'article'
-        ]
-        job_data['description'] = self._extract_text_by_selectors(soup, description_selectors)
-        
+        return self._parse_with_selectors(soup, GENERIC_SELECTORS)
+    
+    def _parse_with_selectors(self, soup: BeautifulSoup, site_selectors: Dict[str, Tuple]) -> Dict:
+        """Fill title/company/location/description from a site's precompiled selectors"""
+        job_data = {
+            field: self._extract_text_by_selectors(soup, selectors)
+            for field, selectors in site_selectors.items()
+        }
         return self._extract_additional_info(job_data, soup)
     
-    def _extract_text_by_selectors(self, soup: BeautifulSoup, selectors: list) -> str:
-        """Extract text using a list of CSS selectors"""
+    def _extract_text_by_selectors(self, soup: BeautifulSoup, selectors: Tuple) -> str:
+        """Extract text using precompiled CSS selectors, in priority order"""
         for selector in selectors:
-            element = soup.select_one(selector)
+            element = selector.select_one(soup)
             if element:
                 text = element.get_text(strip=True)
                 if text:
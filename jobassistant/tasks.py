@@ -0,0 +1,469 @@
+"""
+Celery tasks for AutoCraftCV
+Long-running work moved off the request/response cycle
+"""
+
+from celery import shared_task
+from django.core.cache import cache
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+
+from .utils import ProgressTracker
+
+logger = logging.getLogger(__name__)
+
+# JobPosting and UserProfile columns the content generators read
+JOB_DATA_FIELDS = (
+    'title', 'company', 'location', 'description',
+    'requirements', 'qualifications', 'responsibilities',
+)
+PROFILE_DATA_FIELDS = (
+    'first_name', 'last_name', 'email', 'mobile_phone', 'city', 'state_region', 'country',
+    'linkedin_url', 'portfolio_url', 'professional_summary', 'experience_level',
+)
+
+# Regenerating the same job/profile/options within a day reuses the stored documents
+GENERATED_DOC_CACHE_TIMEOUT = 86400
+
+# Columns generate_selected_documents_task reads from the job
+SELECTED_JOB_FIELDS = JOB_DATA_FIELDS + ('salary_range', 'employment_type')
+
+# PDF/DOCX rendering is CPU-bound - never run more renders at once than there are
+# cores. (Threads rather than a process pool: Celery's prefork workers are daemonic
+# and can't start child processes.)
+RENDER_WORKERS = os.cpu_count() or 1
+
+# Uploads handed to parse_resume_task wait here until a worker has read them
+RESUME_UPLOAD_DIR = 'resume_uploads/pending'
+
+
+def profile_generation_data(**lookup):
+    """The flat profile dict the content generators read, built from a UserProfile and its CV sections (None if not found)"""
+    from .models import Award, Certification, Education, Skill, UserProfile, WorkExperience
+
+    profile = UserProfile.objects.filter(**lookup).values('id', *PROFILE_DATA_FIELDS).first()
+    if profile is None:
+        return None
+
+    # The generators take each section as text - one line per entry
+    profile_id = profile['id']
+    skills = list(Skill.objects.filter(profile_id=profile_id).values_list('category', 'name'))
+    work = WorkExperience.objects.filter(profile_id=profile_id).values_list(
+        'job_title', 'company_name', 'key_responsibilities'
+    )
+    education = Education.objects.filter(profile_id=profile_id).values_list(
+        'degree_type', 'field_of_study', 'institution_name', 'graduation_year'
+    )
+    certifications = Certification.objects.filter(profile_id=profile_id).values_list('name', 'issuing_organization')
+    awards = Award.objects.filter(profile_id=profile_id).values_list('name', 'issuing_organization')
+    degree_names = dict(Education.DEGREE_TYPES)
+
+    return {
+        'full_name': f"{profile['first_name']} {profile['last_name']}".strip(),
+        'email': profile['email'],
+        'phone': profile['mobile_phone'],
+        'location': ', '.join(part for part in (profile['city'], profile['state_region'], profile['country']) if part),
+        'linkedin_url': profile['linkedin_url'],
+        'portfolio_url': profile['portfolio_url'],
+        'professional_summary': profile['professional_summary'],
+        'experience_level': profile['experience_level'],
+        'technical_skills': ', '.join(name for category, name in skills if category != 'soft'),
+        'soft_skills': ', '.join(name for category, name in skills if category == 'soft'),
+        'work_experience': '\n'.join(
+            f"{title} at {company}: {responsibilities}" for title, company, responsibilities in work
+        ),
+        'education': '\n'.join(
+            f"{degree_names.get(degree, degree)} in {field}, {institution} ({year})"
+            for degree, field, institution, year in education
+        ),
+        'certifications': '\n'.join(f"{name} - {issuer}" for name, issuer in certifications),
+        'achievements': '\n'.join(f"{name} - {issuer}" for name, issuer in awards),
+    }
+
+
+@shared_task
+def generate_documents_task(task_id, job_posting_id, user_profile_id, options, use_paid):
+    """Generate a job's documents and queue their files (progress polled via get_progress)"""
+    from .models import GeneratedDocument, JobPosting
+    from .services import get_content_generator
+
+    progress = ProgressTracker(task_id)
+
+    try:
+        progress.update(10, "Loading job posting and profile...", "1/4")
+
+        # Only the columns the generators read, straight into the dicts the services take -
+        # skips raw_content, parsed_content, resume_file and model instance construction
+        job_data = JobPosting.objects.filter(id=job_posting_id).values(*JOB_DATA_FIELDS).first()
+        profile_data = profile_generation_data(id=user_profile_id)
+        if job_data is None or profile_data is None:
+            progress.set_error("Job posting or profile not found")
+            return None
+
+        custom_instructions = options.get('custom_instructions', '')
+        output_format = options['output_format']
+
+        if options['document_type'] == 'both':
+            document_types = ['cover_letter', 'resume']
+        else:
+            document_types = [options['document_type']]
+
+        # Same job, profile and options as an earlier run - reuse those documents
+        cache_keys = {
+            doc_type: _gen_cache_key(job_data, profile_data, custom_instructions, doc_type, output_format)
+            for doc_type in document_types
+        }
+        cached_ids = cache.get_many(list(cache_keys.values()))
+        # Documents whose files failed to render are generated afresh rather than reused
+        failed_ids = cache.get_many([document_files_error_key(doc_id) for doc_id in cached_ids.values()])
+        cached_ids = {
+            key: doc_id for key, doc_id in cached_ids.items()
+            if document_files_error_key(doc_id) not in failed_ids
+        }
+        reusable = {str(doc.id): doc for doc in GeneratedDocument.objects.filter(id__in=cached_ids.values())}
+        cached_docs = {
+            doc_type: reusable[cached_ids[key]]
+            for doc_type, key in cache_keys.items()
+            if cached_ids.get(key) in reusable
+        }
+        pending_types = [doc_type for doc_type in document_types if doc_type not in cached_docs]
+
+        progress.update(30, "Generating content...", "2/4")
+
+        # The LLM calls are independent - run them side by side so "both" costs
+        # the slower of the two rather than their sum
+        results = {}
+        if pending_types:
+            content_generator = get_content_generator(use_paid)
+            generators = {
+                'cover_letter': content_generator.generate_cover_letter,
+                'resume': content_generator.generate_resume,
+            }
+            with ThreadPoolExecutor(max_workers=len(pending_types)) as executor:
+                futures = {
+                    doc_type: executor.submit(generators[doc_type], profile_data, job_data, custom_instructions)
+                    for doc_type in pending_types
+                }
+                results = {doc_type: future.result() for doc_type, future in futures.items()}
+
+        progress.update(80, "Saving documents...", "3/4")
+
+        # Documents are inserted together with their text only; the PDF/DOCX files are
+        # rendered and written to storage by generate_document_files_task once the rows
+        # are committed
+        generated_docs = []
+        new_docs = []
+        for doc_type in document_types:
+            if doc_type in cached_docs:
+                generated_docs.append(cached_docs[doc_type])
+                continue
+
+            result = results[doc_type]
+            if not result.get('content'):
+                continue
+
+            generated_doc = GeneratedDocument(
+                user_profile_id=user_profile_id,
+                job_posting_id=job_posting_id,
+                document_type=doc_type,
+                generation_method=result.get('method', 'unknown'),
+                content=result['content'],
+                title=f"{doc_type.replace('_', ' ').title()} for {job_data['title']}",
+                generation_time=result.get('generation_time', 0)
+            )
+            new_docs.append(generated_doc)
+            generated_docs.append(generated_doc)
+
+        if new_docs:
+            with transaction.atomic():
+                GeneratedDocument.objects.bulk_create(new_docs)
+                for doc in new_docs:
+                    transaction.on_commit(
+                        lambda doc_id=str(doc.id): generate_document_files_task.delay(doc_id, output_format)
+                    )
+            cache.set_many(
+                {cache_keys[doc.document_type]: str(doc.id) for doc in new_docs},
+                timeout=GENERATED_DOC_CACHE_TIMEOUT
+            )
+
+        if not generated_docs:
+            progress.set_error("Failed to generate documents. Please try again.")
+            return None
+
+        document_ids = [str(doc.id) for doc in generated_docs]
+        progress.complete("Documents generated!", {
+            'document_ids': document_ids,
+            'document_names': ' and '.join(doc.document_type.replace('_', ' ').title() for doc in generated_docs),
+        })
+        return document_ids
+
+    except Exception as e:
+        logger.error(
+            "Error generating documents: %s", e, exc_info=True,
+            extra={'job_posting_id': job_posting_id, 'user_profile_id': user_profile_id}
+        )
+        progress.set_error(f"Error generating documents: {str(e)}")
+        return None
+
+
+def document_files_error_key(doc_id):
+    """Cache key recording why a GeneratedDocument's files could not be written"""
+    return f"docfiles_error:{doc_id}"
+
+
+def _gen_cache_key(job_data, profile_data, instructions, doc_type, output_format):
+    """Cache key for a generated document - a hash over everything that shapes its output"""
+    payload = json.dumps(
+        [job_data, profile_data, instructions, doc_type, output_format],
+        sort_keys=True, default=str
+    )
+    return f"gendoc:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+@shared_task
+def generate_document_files_task(doc_id, output_format):
+    """Render a GeneratedDocument's PDF/DOCX files and write them to storage (shown by download_documents)"""
+    from .models import GeneratedDocument
+    from .services import get_document_generator
+
+    try:
+        document = GeneratedDocument.objects.select_related('user_profile').get(id=doc_id)
+        files = _render_files(
+            get_document_generator(), document.content, document.document_type,
+            document.user_profile.full_name, output_format
+        )
+
+        if 'pdf' in files:
+            document.pdf_file.save(files['pdf'].name, files['pdf'], save=False)
+
+        if 'docx' in files:
+            document.docx_file.save(files['docx'].name, files['docx'], save=False)
+
+        document.save(update_fields=['pdf_file', 'docx_file'])
+        return list(files)
+
+    except Exception as e:
+        # Record the failure so the download page reports it instead of waiting for
+        # files that will never arrive
+        logger.error(
+            "Error writing files for document %s: %s", doc_id, e,
+            exc_info=True, extra={'doc_id': doc_id, 'output_format': output_format}
+        )
+        cache.set(document_files_error_key(doc_id), str(e), timeout=GENERATED_DOC_CACHE_TIMEOUT)
+        return []
+
+
+def _render_files(doc_generator, content, doc_type, full_name, output_format):
+    """Render the requested PDF/DOCX files, concurrently when both are wanted"""
+    available = {'pdf': doc_generator.generate_pdf, 'docx': doc_generator.generate_docx}
+    renderers = {
+        file_type: render for file_type, render in available.items()
+        if output_format in (file_type, 'both')
+    }
+
+    if len(renderers) < 2:
+        return {file_type: render(content, doc_type, full_name) for file_type, render in renderers.items()}
+
+    with ThreadPoolExecutor(max_workers=min(len(renderers), RENDER_WORKERS)) as executor:
+        futures = {
+            file_type: executor.submit(render, content, doc_type, full_name)
+            for file_type, render in renderers.items()
+        }
+    return {file_type: future.result() for file_type, future in futures.items()}
+
+
+@shared_task
+def parse_resume_task(task_id, file_path, file_name, session_key):
+    """Parse an uploaded resume into the session's UserProfile (progress polled via get_progress)"""
+    from .models import UserProfile
+    from .services import get_resume_parser
+
+    progress = ProgressTracker(task_id)
+    file_obj = None
+    
+    try:
+        # Stage 1: Upload file
+        progress.update(10, "Uploading file...", "1/6")
+        
+        # Stage 2: Validate file format
+        progress.update(25, "Validating file format...", "2/6")
+        
+        # Stage 3: Extract text content
+        progress.update(45, "Extracting text content...", "3/6")
+        
+        # Parse straight from the staged upload - no in-memory copy of the file
+        file_obj = UploadedFile(
+            default_storage.open(file_path, 'rb'), name=file_name,
+            content_type=mimetypes.guess_type(file_name)[0]
+        )
+        
+        # Stage 4: Parse sections
+        progress.update(65, "Parsing sections...", "4/6")
+        parsed_data = get_resume_parser().parse_resume(file_obj)
+        
+        if parsed_data.get('error'):
+            progress.set_error(f"Failed to parse resume: {parsed_data['error']}")
+            return None
+        
+        # Stage 5: Structure data
+        progress.update(85, "Structuring data...", "5/6")
+        
+        # The parser returns flat text fields; the CV builder schema splits the name,
+        # keeps one location line in city and holds skills as Skill rows. The other
+        # sections need dates the text doesn't give reliably, so they stay in
+        # parsed_content for the wizard to fill from
+        first_name, _, last_name = parsed_data.get('full_name', '').strip().partition(' ')
+        profile_fields = {
+            'first_name': first_name[:100],
+            'last_name': last_name.strip()[:100],
+            'email': parsed_data.get('email', ''),
+            'mobile_phone': parsed_data.get('phone', '')[:20],
+            'city': parsed_data.get('location', '')[:100],
+            'linkedin_url': parsed_data.get('linkedin_url', ''),
+            'portfolio_url': parsed_data.get('portfolio_url', ''),
+            'professional_summary': parsed_data.get('professional_summary', ''),
+            'parsed_content': parsed_data.get('raw_text', ''),
+        }
+        
+        # Stage 6: Save profile
+        progress.update(95, "Finalizing profile...", "6/6")
+        
+        # Create or update UserProfile - empty values never overwrite what the
+        # profile already holds, and an update writes only the columns set here
+        with transaction.atomic():
+            profile, created = UserProfile.objects.update_or_create(
+                session_key=session_key,
+                defaults={field: value for field, value in profile_fields.items() if value}
+            )
+            _add_parsed_skills(profile, parsed_data)
+        
+        # Complete with profile_id included in response
+        progress.complete("Resume parsing completed!", {'profile_id': str(profile.id)})
+        return str(profile.id)
+        
+    except Exception as e:
+        logger.error("Error parsing resume: %s", e, exc_info=True, extra={'resume_name': file_name})
+        progress.set_error(f"Failed to parse resume: {str(e)}")
+        return None
+    
+    finally:
+        if file_obj is not None:
+            file_obj.close()
+        default_storage.delete(file_path)
+
+
+def _add_parsed_skills(profile, parsed_data):
+    """Store the parser's comma-separated skills as Skill rows the profile doesn't have yet"""
+    from .models import Skill
+
+    existing = {name.lower() for name in profile.skills.values_list('name', flat=True)}
+    new_skills = []
+    for field, category in (('technical_skills', 'technical'), ('soft_skills', 'soft')):
+        for name in parsed_data.get(field, '').split(','):
+            name = name.strip()[:100]
+            if name and name.lower() not in existing:
+                existing.add(name.lower())
+                new_skills.append(Skill(profile=profile, name=name, category=category, order=len(existing)))
+    Skill.objects.bulk_create(new_skills)
+
+
+@shared_task
+def generate_selected_documents_task(task_id, job_id, document_types, output_formats, custom_instructions, session_key):
+    """Generate the chosen documents and files for a job (progress polled via get_progress)"""
+    from .models import GeneratedDocument, JobPosting, UserProfile
+    from .services import get_content_generator
+
+    progress = ProgressTracker(task_id)
+    
+    try:
+        # Stage 1: Analyze job posting
+        progress.update(10, "Analyzing job posting...", "1/5")
+        
+        # Only the columns the generators read, straight into the dicts they take
+        job_data = JobPosting.objects.filter(id=job_id).values(*SELECTED_JOB_FIELDS).first()
+        user_profile_id = UserProfile.objects.filter(session_key=session_key).values_list('id', flat=True).first()
+        if job_data is None or user_profile_id is None:
+            progress.set_error("Job posting or profile not found")
+            return None
+        profile_data = profile_generation_data(id=user_profile_id)
+        
+        # Stage 2: Process user profile
+        progress.update(30, "Processing user profile...", "2/5")
+        
+        # Stage 3: Generate content
+        progress.update(60, "Generating content...", "3/5")
+        generator = get_content_generator()
+        generators = {
+            'cover_letter': generator.generate_cover_letter,
+            'resume': generator.generate_resume,
+        }
+        requested_types = [doc_type for doc_type in document_types if doc_type in generators]
+        
+        # Each document is an independent LLM call - run them side by side
+        results = {}
+        if requested_types:
+            with ThreadPoolExecutor(max_workers=len(requested_types)) as executor:
+                futures = {
+                    executor.submit(generators[doc_type], profile_data, job_data, custom_instructions): doc_type
+                    for doc_type in requested_types
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        
+        documents = []
+        for doc_type in requested_types:
+            result = results[doc_type]
+            
+            # Build document record - inserted together with the others below
+            documents.append(GeneratedDocument(
+                job_posting_id=job_id,
+                user_profile_id=user_profile_id,
+                document_type=doc_type,
+                content=result.get('content', ''),
+                title=f"{doc_type.replace('_', ' ').title()} for {job_data['title']}",
+                generation_method=result.get('method', 'unknown'),
+                generation_time=result.get('generation_time', 0)
+            ))
+        
+        # Stage 4: Format output
+        progress.update(85, "Formatting output...", "4/5")
+        
+        # The PDF/DOCX files are rendered and attached to each document by
+        # generate_document_files_task once the rows are committed - the same path
+        # generate_documents_task uses, so download_documents shows them as they land
+        formats = {format_type for format_type in output_formats if format_type in ('pdf', 'docx')}
+        output_format = 'both' if len(formats) == 2 else next(iter(formats), None)
+        with transaction.atomic():
+            GeneratedDocument.objects.bulk_create(documents)
+            if output_format:
+                for document in documents:
+                    transaction.on_commit(
+                        lambda doc_id=str(document.id): generate_document_files_task.delay(doc_id, output_format)
+                    )
+        
+        # Stage 5: Finalize
+        progress.update(95, "Finalizing documents...", "5/5")
+        
+        # Hand the document IDs over through the progress entry - download_documents
+        # adopts them into the browser's session when it's opened with ?task=
+        document_ids = [str(document.id) for document in documents]
+        progress.complete("Document generation completed!", {
+            'document_ids': document_ids,
+            'document_names': ' and '.join(document.document_type.replace('_', ' ').title() for document in documents),
+        })
+        return document_ids
+        
+    except Exception as e:
+        logger.error(
+            "Error generating documents: %s", e, exc_info=True,
+            extra={'job_posting_id': job_id, 'session_key': session_key}
+        )
+        progress.set_error(f"Failed to generate documents: {str(e)}")
+        return None
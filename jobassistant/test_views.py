@@ -2,62 +2,146 @@
 Test views for debugging scraping functionality
 """
 
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from django.shortcuts import redirect
+from django.templatetags.static import static
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.gzip import gzip_page
 from django.views.decorators.http import require_http_methods
+from .responses import ORJSONResponse
 from .services.enhanced_scraping_service import EnhancedJobScrapingService
-import json
+import asyncio
+import orjson
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared across requests so its HTTP session keeps connections alive between tests
+_SCRAPER = EnhancedJobScrapingService()
+
+# Concurrent scrapes per batch request - keeps load on target job boards polite
+BATCH_CONCURRENCY = 10
+
+# Most URLs one batch request may ask for
+MAX_BATCH_URLS = 20
+
+
+def _scrape_and_validate(url):
+    """Scrape one URL and build its test result block"""
+    logger.info(f"Testing scraping for URL: {url}")
+    
+    # Test with enhanced scraper
+    job_data, method = _SCRAPER.scrape_job(url)
+    
+    return {
+        'success': True,
+        'url': url,
+        'method_used': method,
+        'job_data': job_data,
+        'validation': _validate_job_data(job_data)
+    }
+
+
+def _validate_job_data(job_data):
+    """Summarize extracted field lengths, reading each field once"""
+    title_length = len(job_data.get('title') or '')
+    company_length = len(job_data.get('company') or '')
+    description_length = len(job_data.get('description') or '')
+    
+    return {
+        'has_title': title_length > 5,
+        'has_company': company_length > 2,
+        'has_description': description_length > 50,
+        'title_length': title_length,
+        'company_length': company_length,
+        'description_length': description_length
+    }
+
+
+async def _scrape_batch(urls):
+    """Scrape several URLs concurrently, at most BATCH_CONCURRENCY at a time, yielding each result as it finishes"""
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    # thread_sensitive=False lets each scrape run in its own worker thread
+    scrape = sync_to_async(_scrape_and_validate, thread_sensitive=False)
+    
+    async def scrape_one(url):
+        async with semaphore:
+            try:
+                return await scrape(url)
+            except Exception as e:
+                logger.error(f"Error in test_scraping for {url}: {str(e)}")
+                return {'success': False, 'url': url, 'error': str(e)}
+    
+    tasks = [asyncio.ensure_future(scrape_one(url)) for url in urls]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        # Client went away mid-stream - don't start the scrapes still waiting
+        for task in tasks:
+            task.cancel()
+
+
+async def _stream_batch_results(urls):
+    """Send each scrape result as soon as it finishes (in completion order)"""
+    yield b'{"success":true,"results":['
+    first = True
+    async for result in _scrape_batch(urls):
+        if not first:
+            yield b','
+        first = False
+        yield orjson.dumps(result, default=str)
+    yield b']}'
+
 
 @csrf_exempt
 @require_http_methods(["POST"])
-def test_scraping(request):
+@gzip_page
+async def test_scraping(request):
     """
     Test endpoint for debugging job scraping
-    POST data: {"url": "job_url_to_test"}
+    POST data: {"url": "job_url_to_test"} or {"urls": ["job_url", ...]}
     """
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
+        if not isinstance(data, dict):
+            return ORJSONResponse({
+                'success': False,
+                'error': 'Request body must be a JSON object'
+            }, status=400)
+        
+        urls = data.get('urls')
+        
+        if urls is not None:
+            if (not isinstance(urls, list) or not urls or len(urls) > MAX_BATCH_URLS or
+                    not all(isinstance(url, str) and url for url in urls)):
+                return ORJSONResponse({
+                    'success': False,
+                    'error': f'urls must be a list of 1-{MAX_BATCH_URLS} URL strings'
+                }, status=400)
+            
+            return StreamingHttpResponse(_stream_batch_results(urls), content_type='application/json')
+        
         url = data.get('url')
         
-        if not url:
-            return JsonResponse({
+        if not url or not isinstance(url, str):
+            return ORJSONResponse({
                 'success': False,
                 'error': 'URL is required'
             }, status=400)
         
-        logger.info(f"Testing scraping for URL: {url}")
-        
-        # Test with enhanced scraper
-        scraper = EnhancedJobScrapingService()
-        job_data, method = scraper.scrape_job(url)
+        result = await sync_to_async(_scrape_and_validate, thread_sensitive=False)(url)
+        return ORJSONResponse(result)
         
-        return JsonResponse({
-            'success': True,
-            'url': url,
-            'method_used': method,
-            'job_data': job_data,
-            'validation': {
-                'has_title': bool(job_data.get('title') and len(job_data['title']) > 5),
-                'has_company': bool(job_data.get('company') and len(job_data['company']) > 2),
-                'has_description': bool(job_data.get('description') and len(job_data['description']) > 50),
-                'title_length': len(job_data.get('title', '')),
-                'company_length': len(job_data.get('company', '')),
-                'description_length': len(job_data.get('description', ''))
-            }
-        })
-        
-    except json.JSONDecodeError:
-        return JsonResponse({
+    except orjson.JSONDecodeError:
+        return ORJSONResponse({
             'success': False,
             'error': 'Invalid JSON in request body'
         }, status=400)
     except Exception as e:
         logger.error(f"Error in test_scraping: {str(e)}")
-        return JsonResponse({
+        return ORJSONResponse({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -66,123 +150,6 @@ def test_scraping(request):
 @require_http_methods(["GET"])
 def test_scraping_page(request):
     """
-    Simple HTML page for testing scraping functionality
-    """
-    html_content = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Job Scraping Test</title>
-        <style>
-            body { font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }
-            .form-group { margin-bottom: 15px; }
-            label { display: block; margin-bottom: 5px; font-weight: bold; }
-            input[type="text"] { width: 100%; padding: 8px; border: 1px solid #ccc; border-radius: 4px; }
-            button { background-color: #007bff; color: white; padding: 10px 20px; border: none; border-radius: 4px; cursor: pointer; }
-            button:hover { background-color: #0056b3; }
-            .result { margin-top: 20px; padding: 15px; border: 1px solid #ccc; border-radius: 4px; background-color: #f9f9f9; }
-            .error { border-color: #dc3545; background-color: #f8d7da; }
-            .success { border-color: #28a745; background-color: #d4edda; }
-            pre { background-color: #f4f4f4; padding: 10px; border-radius: 4px; overflow-x: auto; }
-        </style>
-    </head>
-    <body>
-        <h1>Job Scraping Test Tool</h1>
-        <p>Test the enhanced job scraping functionality by entering a job posting URL below.</p>
-        
-        <form id="testForm">
-            <div class="form-group">
-                <label for="url">Job Posting URL:</label>
-                <input type="text" id="url" name="url" placeholder="https://example.com/job-posting" required>
-            </div>
-            <button type="submit">Test Scraping</button>
-        </form>
-        
-        <div id="result" style="display: none;"></div>
-        
-        <div style="margin-top: 30px;">
-            <h3>Test URLs (Examples):</h3>
-            <ul>
-                <li><a href="#" onclick="testUrl('https://www.linkedin.com/jobs/view/3774394042')">LinkedIn Job Example</a></li>
-                <li><a href="#" onclick="testUrl('https://www.indeed.com/viewjob?jk=example')">Indeed Job Example</a></li>
-                <li><a href="#" onclick="testUrl('https://www.glassdoor.com/job-listing/example')">Glassdoor Job Example</a></li>
-            </ul>
-            <p><em>Note: Replace with actual job URLs to test</em></p>
-        </div>
-        
-        <script>
-            function testUrl(url) {
-                document.getElementById('url').value = url;
-            }
-            
-            document.getElementById('testForm').addEventListener('submit', function(e) {
-                e.preventDefault();
-                
-                const url = document.getElementById('url').value;
-                const resultDiv = document.getElementById('result');
-                
-                if (!url) {
-                    alert('Please enter a URL');
-                    return;
-                }
-                
-                resultDiv.style.display = 'block';
-                resultDiv.className = 'result';
-                resultDiv.innerHTML = '<p>Testing scraping... Please wait.</p>';
-                
-                fetch('/jobassistant/test-scraping/', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({ url: url })
-                })
-                .then(response => response.json())
-                .then(data => {
-                    if (data.success) {
-                        resultDiv.className = 'result success';
-                        resultDiv.innerHTML = `
-                            <h3>Scraping Successful!</h3>
-                            <p><strong>Method Used:</strong> ${data.method_used}</p>
-                            <p><strong>URL:</strong> ${data.url}</p>
-                            
-                            <h4>Extracted Data:</h4>
-                            <p><strong>Title:</strong> ${data.job_data.title || 'Not extracted'}</p>
-                            <p><strong>Company:</strong> ${data.job_data.company || 'Not extracted'}</p>
-                            <p><strong>Location:</strong> ${data.job_data.location || 'Not extracted'}</p>
-                            <p><strong>Employment Type:</strong> ${data.job_data.employment_type || 'Not extracted'}</p>
-                            <p><strong>Salary Range:</strong> ${data.job_data.salary_range || 'Not extracted'}</p>
-                            
-                            <h4>Validation Results:</h4>
-                            <ul>
-                                <li>Has Title: ${data.validation.has_title ? '✅ Yes' : '❌ No'} (${data.validation.title_length} chars)</li>
-                                <li>Has Company: ${data.validation.has_company ? '✅ Yes' : '❌ No'} (${data.validation.company_length} chars)</li>
-                                <li>Has Description: ${data.validation.has_description ? '✅ Yes' : '❌ No'} (${data.validation.description_length} chars)</li>
-                            </ul>
-                            
-                            <h4>Full Job Data:</h4>
-                            <pre>${JSON.stringify(data.job_data, null, 2)}</pre>
-                        `;
-                    } else {
-                        resultDiv.className = 'result error';
-                        resultDiv.innerHTML = `
-                            <h3>Scraping Failed</h3>
-                            <p><strong>Error:</strong> ${data.error}</p>
-                        `;
-                    }
-                })
-                .catch(error => {
-                    resultDiv.className = 'result error';
-                    resultDiv.innerHTML = `
-                        <h3>Request Failed</h3>
-                        <p><strong>Error:</strong> ${error.message}</p>
-                    `;
-                });
-            });
-        </script>
-    </body>
-    </html>
+    Simple HTML page for testing scraping functionality - served as a static file
     """
-    
-    from django.http import HttpResponse
-    return HttpResponse(html_content)
+    return redirect(static('jobassistant/scraping_test.html'))
@@ -1,3 +1,1053 @@
-from django.test import TestCase
+import gzip
+import importlib.util
+import io
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date
+from unittest import mock
+from urllib.parse import urlparse
 
-# Create your tests here.
+from bs4 import BeautifulSoup
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.forms.models import model_to_dict
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from django.templatetags.static import static
+from django.test.utils import CaptureQueriesContext
+from docx import Document
+from django.urls import reverse
+
+from autocraftcv.celery import app as celery_app
+
+from . import safe_data_utils, services, tasks, test_views, utils, views_new
+from .models import Award, GeneratedDocument, JobPosting, Skill, UserProfile, WorkExperience
+from .models import ProgressTask
+from .services import scraping_service
+from .services.scraping_service import JobScrapingService
+from .utils import ProgressTracker
+
+# Pages render without running collectstatic first
+PLAIN_STATIC_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+class ProgressCacheMixin:
+    """Start every test with empty progress caches"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        utils._local_progress.clear()
+
+
+class EagerTaskMixin(ProgressCacheMixin):
+    """Run Celery tasks in-process and write generated files to a scratch MEDIA_ROOT"""
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, 'task_always_eager', False)
+
+
+def make_profile(session_key='', **fields):
+    """A CV profile with one technical skill, one soft skill and one role"""
+    profile = UserProfile.objects.create(
+        session_key=session_key, first_name='Jane', last_name='Doe', email='jane@example.com',
+        mobile_phone='021 555 0100', city='Auckland', country='New Zealand', **fields
+    )
+    Skill.objects.create(profile=profile, name='Python', category='programming')
+    Skill.objects.create(profile=profile, name='Teamwork', category='soft')
+    WorkExperience.objects.create(
+        profile=profile, job_title='Developer', company_name='Acme', company_location='Auckland',
+        employment_type='full_time', start_date=date(2020, 1, 1), key_responsibilities='Built APIs'
+    )
+    return profile
+
+
+def make_job():
+    return JobPosting.objects.create(
+        url='https://example.com/jobs/1', title='Backend Engineer', company='Globex',
+        location='Wellington', description='Build services', requirements='Python'
+    )
+
+
+def make_resume_docx():
+    """A small .docx resume the free parser can read"""
+    document = Document()
+    for line in ("Jane Doe", "jane.doe@example.com", "", "Skills", "Python, Django, SQL", "Teamwork, Communication"):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class ProgressApiTests(ProgressCacheMixin, TestCase):
+    """get_progress and recover_progress serve ProgressTracker state"""
+
+    task_id = '3f2c9a1e-5b7d-4c8e-9f01-23456789abcd'
+
+    def test_get_progress_returns_tracker_state(self):
+        ProgressTracker(self.task_id).update(40, "Parsing sections...", "4/6")
+
+        response = self.client.get(reverse('jobassistant:get_progress', args=[self.task_id]))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['progress'], 40)
+        self.assertEqual(data['status'], "Parsing sections...")
+        self.assertFalse(data['completed'])
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_get_progress_answers_unchanged_poll_with_304(self):
+        ProgressTracker(self.task_id).update(40, "Parsing sections...", "4/6")
+        url = reverse('jobassistant:get_progress', args=[self.task_id])
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_get_progress_sends_new_body_after_an_update(self):
+        tracker = ProgressTracker(self.task_id)
+        tracker.update(40, "Parsing sections...", "4/6")
+        url = reverse('jobassistant:get_progress', args=[self.task_id])
+        etag = self.client.get(url)['ETag']
+
+        tracker.complete("Done!")
+        utils._local_progress.clear()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['completed'])
+
+    def test_get_progress_reads_database_backup(self):
+        ProgressTask.objects.create(
+            task_id=self.task_id, status='processing', progress=25,
+            current_step="Validating file format...", result_data={'stage': '2/6'}
+        )
+
+        response = self.client.get(reverse('jobassistant:get_progress', args=[self.task_id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['stage'], '2/6')
+
+    def test_get_progress_unknown_task_is_404(self):
+        response = self.client.get(reverse('jobassistant:get_progress', args=[self.task_id]))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_malformed_task_id_does_not_resolve(self):
+        response = self.client.get('/api/progress/not-a-task/')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('task_id', response.content.decode())
+
+    def test_recover_progress_reports_lost_task_as_failed(self):
+        response = self.client.get(reverse('jobassistant:recover_progress', args=[self.task_id]))
+
+        data = response.json()
+        self.assertEqual(data['status'], 'recovered')
+        self.assertTrue(data['progress_data']['completed'])
+        self.assertTrue(data['progress_data']['error'])
+
+
+class ProfileGenerationDataTests(TestCase):
+    """profile_generation_data flattens a UserProfile for the content generators"""
+
+    def test_builds_generator_fields_from_profile_and_sections(self):
+        profile = make_profile()
+
+        data = tasks.profile_generation_data(id=profile.id)
+
+        self.assertEqual(data['full_name'], 'Jane Doe')
+        self.assertEqual(data['phone'], '021 555 0100')
+        self.assertEqual(data['location'], 'Auckland, New Zealand')
+        self.assertEqual(data['technical_skills'], 'Python')
+        self.assertEqual(data['soft_skills'], 'Teamwork')
+        self.assertEqual(data['work_experience'], 'Developer at Acme: Built APIs')
+
+    def test_missing_profile_is_none(self):
+        self.assertIsNone(tasks.profile_generation_data(id=uuid.uuid4()))
+
+
+class GenerateDocumentsTaskTests(EagerTaskMixin, TestCase):
+    """generate_documents_task run eagerly against real models"""
+
+    options = {'document_type': 'resume', 'output_format': 'pdf', 'custom_instructions': ''}
+
+    def run_task(self, task_id, job, profile):
+        with self.captureOnCommitCallbacks(execute=True):
+            return tasks.generate_documents_task.apply(
+                args=(task_id, str(job.id), str(profile.id), self.options, False)
+            ).get()
+
+    def test_generates_document_and_attaches_files(self):
+        job, profile = make_job(), make_profile()
+
+        document_ids = self.run_task('task-1', job, profile)
+
+        document = GeneratedDocument.objects.get(id=document_ids[0])
+        self.assertEqual(document.document_type, 'resume')
+        self.assertIn('JANE DOE', document.content)
+        self.assertIn('Python', document.content)
+        self.assertTrue(document.pdf_file)
+        self.assertFalse(document.docx_file)
+
+        progress_data = ProgressTracker.get_progress('task-1')
+        self.assertTrue(progress_data['completed'])
+        self.assertIsNone(progress_data['error'])
+        self.assertEqual(progress_data['document_ids'], document_ids)
+
+    def test_repeat_request_reuses_stored_document(self):
+        job, profile = make_job(), make_profile()
+
+        first = self.run_task('task-1', job, profile)
+        second = self.run_task('task-2', job, profile)
+
+        self.assertEqual(first, second)
+        self.assertEqual(GeneratedDocument.objects.count(), 1)
+
+    def test_missing_profile_reports_error(self):
+        job = make_job()
+        missing = UserProfile(id=uuid.uuid4())
+
+        self.assertIsNone(self.run_task('task-1', job, missing))
+        self.assertEqual(ProgressTracker.get_progress('task-1')['error'], "Job posting or profile not found")
+
+
+@override_settings(STORAGES=PLAIN_STATIC_STORAGES)
+class DocumentViewsTests(ProgressCacheMixin, TestCase):
+    """generate_documents queues the task; the download views only serve this visitor's documents"""
+
+    def start_session(self, **values):
+        session = self.client.session
+        session.update(values)
+        session.save()
+        return session.session_key
+
+    def make_document(self, profile, job):
+        return GeneratedDocument.objects.create(
+            user_profile=profile, job_posting=job, document_type='resume',
+            generation_method='template', content='Jane Doe resume', title='Resume'
+        )
+
+    def test_generate_documents_queues_task_for_session_profile(self):
+        job = make_job()
+        profile = make_profile(session_key=self.start_session(current_job_id=str(job.id)))
+
+        with mock.patch.object(tasks.generate_documents_task, 'delay') as delay:
+            response = self.client.post(reverse('jobassistant:generate_documents'), {
+                'document_type': 'both', 'output_format': 'pdf', 'custom_instructions': '',
+            })
+
+        self.assertTemplateUsed(response, 'jobassistant/generating_wait.html')
+        task_id, job_id, profile_id, options, use_paid = delay.call_args.args
+        self.assertEqual((job_id, profile_id), (str(job.id), str(profile.id)))
+        self.assertEqual(options['document_type'], 'both')
+        self.assertEqual(ProgressTask.objects.get(task_id=task_id).current_step, "Queued...")
+
+    def test_generate_documents_without_profile_redirects_home(self):
+        self.start_session(current_job_id=str(make_job().id))
+
+        with mock.patch.object(tasks.generate_documents_task, 'delay') as delay:
+            response = self.client.post(reverse('jobassistant:generate_documents'), {
+                'document_type': 'resume', 'output_format': 'pdf',
+            })
+
+        self.assertRedirects(response, reverse('jobassistant:home'), fetch_redirect_response=False)
+        delay.assert_not_called()
+
+    def test_download_documents_adopts_only_own_documents(self):
+        job = make_job()
+        own = self.make_document(make_profile(session_key=self.start_session()), job)
+        other = self.make_document(make_profile(session_key='someone-else'), job)
+        ProgressTracker('task-1').complete("Done!", {
+            'document_ids': [str(own.id), str(other.id)], 'document_names': 'Resume',
+        })
+
+        response = self.client.get(reverse('jobassistant:download_documents') + '?task=task-1')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([doc['id'] for doc in response.context['documents']], [own.id])
+        self.assertEqual(self.client.session['generated_doc_ids'], [str(own.id)])
+
+    def test_download_documents_ignores_task_of_another_visitor(self):
+        self.start_session()
+        other = self.make_document(make_profile(session_key='someone-else'), make_job())
+        ProgressTracker('task-1').complete("Done!", {'document_ids': [str(other.id)], 'document_names': 'Resume'})
+
+        response = self.client.get(reverse('jobassistant:download_documents') + '?task=task-1')
+
+        self.assertRedirects(response, reverse('jobassistant:home'), fetch_redirect_response=False)
+
+    def test_download_file_requires_document_in_session(self):
+        self.start_session()
+        document = self.make_document(make_profile(session_key='someone-else'), make_job())
+
+        response = self.client.get(reverse('jobassistant:download_file', args=[document.id, 'pdf']))
+
+        self.assertEqual(response.status_code, 404)
+
+
+class ParseResumeTaskTests(EagerTaskMixin, TestCase):
+    """parse_resume_task run eagerly on a staged .docx"""
+
+    session_key = 'resume-session'
+
+    def run_task(self, task_id='task-1'):
+        file_path = default_storage.save(f"{tasks.RESUME_UPLOAD_DIR}/jane.docx", ContentFile(make_resume_docx()))
+        result = tasks.parse_resume_task.apply(args=(task_id, file_path, 'jane.docx', self.session_key)).get()
+        return result, file_path
+
+    def test_creates_profile_from_parsed_resume(self):
+        profile_id, file_path = self.run_task()
+
+        profile = UserProfile.objects.get(id=profile_id)
+        self.assertEqual(profile.session_key, self.session_key)
+        self.assertEqual((profile.first_name, profile.last_name), ('Jane', 'Doe'))
+        self.assertEqual(profile.email, 'jane.doe@example.com')
+        self.assertIn('Python, Django, SQL', profile.parsed_content)
+        self.assertEqual(
+            set(profile.skills.values_list('name', 'category')),
+            {('Python', 'technical'), ('Django', 'technical'), ('SQL', 'technical'),
+             ('Teamwork', 'soft'), ('Communication', 'soft')}
+        )
+        self.assertFalse(default_storage.exists(file_path))
+        self.assertEqual(ProgressTracker.get_progress('task-1')['profile_id'], profile_id)
+
+    def test_updates_existing_profile_without_clearing_fields(self):
+        existing = UserProfile.objects.create(session_key=self.session_key, mobile_phone='021 555 0100')
+        Skill.objects.create(profile=existing, name='python', category='programming')
+
+        profile_id, _ = self.run_task()
+
+        profile = UserProfile.objects.get(id=profile_id)
+        self.assertEqual(profile.id, existing.id)
+        self.assertEqual(profile.mobile_phone, '021 555 0100')
+        self.assertEqual(profile.first_name, 'Jane')
+        self.assertEqual(profile.skills.filter(name__iexact='python').count(), 1)
+
+    def test_unreadable_file_reports_error(self):
+        file_path = default_storage.save(f"{tasks.RESUME_UPLOAD_DIR}/notes.txt", ContentFile(b"plain text"))
+
+        result = tasks.parse_resume_task.apply(args=('task-1', file_path, 'notes.txt', self.session_key)).get()
+
+        self.assertIsNone(result)
+        self.assertTrue(ProgressTracker.get_progress('task-1')['error'])
+        self.assertFalse(UserProfile.objects.exists())
+        self.assertFalse(default_storage.exists(file_path))
+
+
+class ParseResumeWithProgressTests(EagerTaskMixin, TestCase):
+    """parse_resume_with_progress stages the upload and queues parse_resume_task"""
+
+    def test_queues_parse_of_staged_upload(self):
+        upload = SimpleUploadedFile('jane.docx', make_resume_docx())
+
+        with mock.patch.object(tasks.parse_resume_task, 'delay') as delay:
+            response = self.client.post(reverse('jobassistant:parse_resume_with_progress'), {'resume_file': upload})
+
+        task_id = response.json()['task_id']
+        queued_task_id, file_path, file_name, session_key = delay.call_args.args
+        self.assertEqual(queued_task_id, task_id)
+        self.assertEqual(file_name, 'jane.docx')
+        self.assertEqual(session_key, self.client.session.session_key)
+        self.assertTrue(default_storage.exists(file_path))
+        self.assertEqual(ProgressTracker.get_progress(task_id)['status'], "Queued...")
+
+    def test_requires_a_file(self):
+        response = self.client.post(reverse('jobassistant:parse_resume_with_progress'))
+
+        self.assertEqual(response.status_code, 400)
+
+
+class GenerateSelectedDocumentsTaskTests(EagerTaskMixin, TestCase):
+    """generate_selected_documents_task run eagerly for the session's profile"""
+
+    session_key = 'generate-session'
+
+    def run_task(self, job_id, output_formats=()):
+        with self.captureOnCommitCallbacks(execute=True):
+            return tasks.generate_selected_documents_task.apply(
+                args=('task-1', job_id, ['resume'], list(output_formats), '', self.session_key)
+            ).get()
+
+    def test_generates_requested_documents_for_session_profile(self):
+        job, profile = make_job(), make_profile(session_key=self.session_key)
+
+        document_ids = self.run_task(str(job.id))
+
+        document = GeneratedDocument.objects.get(id=document_ids[0])
+        self.assertEqual(document.user_profile_id, profile.id)
+        self.assertEqual(document.title, 'Resume for Backend Engineer')
+        self.assertIn('JANE DOE', document.content)
+        self.assertIn('021 555 0100', document.content)
+        self.assertEqual(ProgressTracker.get_progress('task-1')['document_ids'], document_ids)
+
+    def test_rendered_files_are_attached_to_documents(self):
+        job = make_job()
+        make_profile(session_key=self.session_key)
+
+        document_ids = self.run_task(str(job.id), output_formats=['pdf', 'docx'])
+
+        document = GeneratedDocument.objects.get(id=document_ids[0])
+        self.assertTrue(document.pdf_file.name.endswith('.pdf'))
+        self.assertTrue(document.docx_file.name.endswith('.docx'))
+        self.assertTrue(default_storage.exists(document.pdf_file.name))
+
+    def test_no_files_without_output_formats(self):
+        job = make_job()
+        make_profile(session_key=self.session_key)
+
+        document = GeneratedDocument.objects.get(id=self.run_task(str(job.id))[0])
+
+        self.assertFalse(document.pdf_file)
+        self.assertFalse(document.docx_file)
+
+    def test_missing_profile_reports_error(self):
+        self.assertIsNone(self.run_task(str(make_job().id)))
+        self.assertEqual(ProgressTracker.get_progress('task-1')['error'], "Job posting or profile not found")
+
+
+class GenerateDocumentsWithProgressTests(ProgressCacheMixin, TestCase):
+    """generate_documents_with_progress validates the request and queues the task"""
+
+    def post(self, payload):
+        return self.client.post(
+            reverse('jobassistant:generate_documents_with_progress'),
+            payload if isinstance(payload, str) else json.dumps(payload), content_type='application/json'
+        )
+
+    def test_queues_task_for_session(self):
+        with mock.patch.object(tasks.generate_selected_documents_task, 'delay') as delay:
+            response = self.post({'job_id': 'job-1', 'document_types': ['resume'], 'output_formats': ['pdf']})
+
+        task_id = response.json()['task_id']
+        self.assertEqual(
+            delay.call_args.args,
+            (task_id, 'job-1', ['resume'], ['pdf'], '', self.client.session.session_key)
+        )
+
+    def test_rejects_missing_fields_and_bad_json(self):
+        with mock.patch.object(tasks.generate_selected_documents_task, 'delay') as delay:
+            self.assertEqual(self.post({'job_id': 'job-1'}).status_code, 400)
+            self.assertEqual(self.post('{not json').status_code, 400)
+
+        delay.assert_not_called()
+
+
+class ExtractDomainTests(TestCase):
+    """extract_domain_from_url keeps urlparse's answers behind the regex fast path"""
+
+    def test_fast_path_matches_urlparse(self):
+        for url in ('https://www.SEEK.com.au/job/1', 'http://example.com', 'https://a.io?q=1', 'https://b.io#x'):
+            self.assertEqual(safe_data_utils.extract_domain_from_url(url), urlparse(url).netloc.lower())
+
+    def test_urls_outside_fast_path_fall_back_to_urlparse(self):
+        self.assertEqual(safe_data_utils.extract_domain_from_url('ftp://Files.example.com/x'), 'files.example.com')
+        self.assertEqual(safe_data_utils.extract_domain_from_url(''), '')
+        self.assertEqual(safe_data_utils.extract_domain_from_url('https://[::1'), 'unknown')
+
+    def test_missing_url_does_not_raise(self):
+        self.assertEqual(safe_data_utils.extract_domain_from_url(None), urlparse(None).netloc.lower())
+
+
+class LocationExtractionTests(TestCase):
+    """enhance_location_extraction keeps the original strategy order and picks"""
+
+    def test_text_strategies_pick_the_same_location_as_before(self):
+        # Expected values are what the original per-pattern implementation returned
+        cases = {
+            'Senior Developer, Brisbane, QLD': 'Brisbane, QLD',
+            'Based at Docklands, Victoria': 'Based at Docklands, Vic',
+            'Apply Now, Brisbane': 'Brisbane',
+            'This role is Remote friendly': 'Remote',
+            'Springfield City, Illinois': 'Springfield City, Illinois',
+            'based in perth wa': 'perth',
+            'Nothing to see here': 'Location Not Available',
+            '': 'Location Not Available',
+        }
+        for page_text, expected in cases.items():
+            with self.subTest(page_text=page_text):
+                self.assertEqual(safe_data_utils.enhance_location_extraction(page_text), expected)
+
+    def test_rejected_match_does_not_hide_a_later_pattern_inside_it(self):
+        # "Foo Bar Sydney Engineer, QLD" fails validation; the city inside it still counts
+        self.assertEqual(
+            safe_data_utils.enhance_location_extraction('Foo Bar Sydney Engineer, QLD office in Melbourne'),
+            'Sydney'
+        )
+        self.assertEqual(safe_data_utils.enhance_location_extraction('Foo Bar Sydney Engineer, QLD'), 'Sydney')
+
+    def test_indicator_context_follows_indicator_priority(self):
+        # "queensland" ranks ahead of "qld", so its context wins although it comes later
+        page_text = 'we hire in Townsville qld ' + 'and more words here ' * 4 + 'plus Cairns queensland'
+
+        self.assertEqual(safe_data_utils.enhance_location_extraction(page_text), 'Cairns')
+        self.assertEqual(safe_data_utils.enhance_location_extraction('we hire in Gold Coast queensland'), 'Gold Coast')
+
+    def test_selectors_are_tried_in_priority_order(self):
+        soup = BeautifulSoup(
+            '<span>Apply now</span><span>Sydney CBD</span>'
+            '<div class="job-criteria__text">Parramatta, NSW</div>',
+            'html.parser'
+        )
+        self.assertEqual(safe_data_utils.enhance_location_extraction('', soup=soup), 'Parramatta, NSW')
+
+        soup = BeautifulSoup('<span>Save job</span><span>Sydney CBD</span>', 'html.parser')
+        self.assertEqual(safe_data_utils.enhance_location_extraction('Remote', soup=soup), 'Sydney CBD')
+
+    def test_is_valid_location_answers_as_before(self):
+        cases = {
+            'Sydney': True,
+            'Sydney, NSW': True,
+            'Parramatta NSW 2150': True,
+            'somewhere in the cbd': True,
+            'Ultimo': True,
+            'Software Engineer': False,
+            'x': False,
+            'a' * 60: False,
+            '': False,
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertIs(safe_data_utils.is_valid_location(text), expected)
+
+    def test_missing_ahocorasick_names_the_package_to_install(self):
+        spec = importlib.util.find_spec('jobassistant.safe_data_utils')
+        module = importlib.util.module_from_spec(spec)
+        with mock.patch.dict(sys.modules, {'ahocorasick': None}):
+            with self.assertRaisesRegex(ImportError, 'pyahocorasick'):
+                spec.loader.exec_module(module)
+
+
+class ProgressTrackerTests(ProgressCacheMixin, TestCase):
+    """ProgressTracker cache entries, database backups and stage tables"""
+
+    task_id = '0a1b2c3d4e5f60718293a4b5'
+
+    def backup(self):
+        return ProgressTask.objects.get(task_id=self.task_id)
+
+    def test_database_backup_is_throttled_between_updates(self):
+        tracker = ProgressTracker(self.task_id)
+        tracker.update(10, "Fetching job page...")
+        tracker.update(20, "Parsing HTML content...")
+
+        self.assertEqual(self.backup().progress, 10)
+        self.assertEqual(ProgressTracker.get_progress(self.task_id)['progress'], 20)
+
+        with mock.patch.object(utils, 'DB_FLUSH_INTERVAL', 0):
+            tracker.update(30, "Extracting job details...")
+        self.assertEqual(self.backup().progress, 30)
+
+    def test_terminal_states_are_always_flushed(self):
+        tracker = ProgressTracker(self.task_id)
+        tracker.update(10, "Fetching job page...")
+        tracker.complete("Done!", {'job_id': 'job-1'})
+
+        backup = self.backup()
+        self.assertEqual((backup.status, backup.progress), ('completed', 100))
+        self.assertEqual(backup.result_data['job_id'], 'job-1')
+
+        ProgressTracker(self.task_id).set_error("Page not found")
+        backup = self.backup()
+        self.assertEqual(backup.status, 'failed')
+        self.assertEqual(backup.error_message, "Page not found")
+
+    def test_cache_entry_is_orjson_bytes_that_round_trip(self):
+        job_id = uuid.uuid4()
+        ProgressTracker(self.task_id).complete("Done!", {'job_id': job_id, 'files': ['a.pdf']})
+        utils._local_progress.clear()
+
+        blob = cache.get(f'progress_{self.task_id}')
+        self.assertIsInstance(blob, bytes)
+        progress_data = ProgressTracker.get_progress(self.task_id)
+        self.assertEqual(progress_data, json.loads(blob))
+        self.assertEqual(progress_data['job_id'], str(job_id))
+        self.assertEqual(progress_data['files'], ['a.pdf'])
+
+    def test_unchanged_tick_skips_cache_and_database_writes(self):
+        tracker = ProgressTracker(self.task_id, total_steps=200)
+        first = tracker.update(40, "Parsing sections...", "4/6")
+
+        with mock.patch.object(utils, '_write_progress') as write, \
+                mock.patch.object(ProgressTracker, '_persist') as persist:
+            # 41/200 still rounds down to 20%
+            again = tracker.update(41, "Parsing sections...")
+
+        self.assertIs(again, first)
+        self.assertEqual(first['progress'], 20)
+        write.assert_not_called()
+        persist.assert_not_called()
+
+    def test_stage_for_matches_a_scan_of_the_stage_table(self):
+        for stages in (utils.JobScrapingProgress, utils.ResumeParsingProgress, utils.AIGenerationProgress):
+            for progress in range(0, 101):
+                expected = next(
+                    ((message, label) for threshold, message, label in stages.STAGES if threshold >= progress),
+                    stages.STAGES[-1][1:]
+                )
+                with self.subTest(stages=stages.__name__, progress=progress):
+                    self.assertEqual(stages.stage_for(progress), expected)
+
+    def test_fresh_reads_are_served_from_the_micro_cache(self):
+        ProgressTracker(self.task_id).update(40, "Parsing sections...")
+        cache.delete(f'progress_{self.task_id}')
+
+        with mock.patch.object(utils.cache, 'get') as cache_get:
+            self.assertEqual(ProgressTracker.get_progress(self.task_id)['progress'], 40)
+        cache_get.assert_not_called()
+
+    def test_expired_micro_cache_entry_falls_through_to_the_cache(self):
+        ProgressTracker(self.task_id).update(40, "Parsing sections...")
+        expires_at, progress_data = utils._local_progress[self.task_id]
+        utils._local_progress[self.task_id] = (expires_at - 1, {**progress_data, 'progress': 0})
+
+        self.assertEqual(ProgressTracker.get_progress(self.task_id)['progress'], 40)
+
+    def test_cleanup_progress_drops_both_cache_layers(self):
+        ProgressTracker(self.task_id).update(40, "Parsing sections...")
+        ProgressTask.objects.all().delete()
+
+        ProgressTracker.cleanup_progress(self.task_id)
+
+        self.assertIsNone(ProgressTracker.get_progress(self.task_id))
+
+    def test_mark_queued_without_shared_cache_writes_only_the_database(self):
+        ProgressTracker(self.task_id).mark_queued("Queued for parsing...")
+
+        self.assertIsNone(cache.get(f'progress_{self.task_id}'))
+        backup = self.backup()
+        self.assertEqual((backup.status, backup.progress, backup.current_step), ('processing', 0, "Queued for parsing..."))
+
+    def test_mark_queued_with_shared_cache_publishes_to_the_cache(self):
+        with mock.patch.object(utils, 'SHARED_PROGRESS_CACHE', True):
+            ProgressTracker(self.task_id).mark_queued()
+            ProgressTracker(self.task_id).update(50, "Working...")
+
+        self.assertEqual(ProgressTracker.get_progress(self.task_id)['progress'], 50)
+        self.assertFalse(ProgressTask.objects.filter(task_id=self.task_id).exists())
+
+    def test_database_fallback_caches_only_finished_tasks(self):
+        ProgressTask.objects.create(task_id=self.task_id, status='processing', progress=25, current_step="Working...")
+
+        self.assertEqual(ProgressTracker.get_progress(self.task_id)['progress'], 25)
+        self.assertIsNone(cache.get(f'progress_{self.task_id}'))
+
+        ProgressTask.objects.filter(task_id=self.task_id).update(status='completed', progress=100)
+        utils._local_progress.clear()
+        self.assertTrue(ProgressTracker.get_progress(self.task_id)['completed'])
+        self.assertIsNotNone(cache.get(f'progress_{self.task_id}'))
+
+
+def fake_scrape(url):
+    """Stand-in for EnhancedJobScrapingService.scrape_job"""
+    if 'broken' in url:
+        raise RuntimeError("Connection reset")
+    return {'title': 'Backend Engineer', 'company': 'Globex', 'description': 'Build services'}, 'requests'
+
+
+class TestScrapingViewTests(TestCase):
+    """test_scraping validates the request and scrapes one URL or a batch"""
+
+    def setUp(self):
+        super().setUp()
+        scrape_job = mock.patch.object(test_views._SCRAPER, 'scrape_job', side_effect=fake_scrape)
+        self.scrape_job = scrape_job.start()
+        self.addCleanup(scrape_job.stop)
+
+    async def post(self, payload):
+        return await self.async_client.post(
+            reverse('jobassistant:test_scraping'),
+            payload if isinstance(payload, str) else json.dumps(payload), content_type='application/json'
+        )
+
+    async def test_single_url_returns_result_with_validation(self):
+        response = await self.post({'url': 'https://example.com/jobs/1'})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['method_used'], 'requests')
+        self.assertEqual(data['validation'], {
+            'has_title': True, 'has_company': True, 'has_description': False,
+            'title_length': 16, 'company_length': 6, 'description_length': 14,
+        })
+
+    async def test_invalid_requests_are_rejected_before_scraping(self):
+        too_many = [f'https://example.com/jobs/{n}' for n in range(test_views.MAX_BATCH_URLS + 1)]
+        for payload in ('{not json', '[]', {}, {'url': 5}, {'urls': []}, {'urls': 'https://example.com'},
+                        {'urls': ['https://example.com', '']}, {'urls': too_many}):
+            with self.subTest(payload=payload):
+                response = await self.post(payload)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+
+        self.scrape_job.assert_not_called()
+
+    async def test_batch_scrapes_at_most_batch_concurrency_urls_at_once(self):
+        lock = threading.Lock()
+        running = {'now': 0, 'peak': 0}
+
+        def slow_scrape(url):
+            with lock:
+                running['now'] += 1
+                running['peak'] = max(running['peak'], running['now'])
+            time.sleep(0.05)
+            with lock:
+                running['now'] -= 1
+            return fake_scrape(url)
+
+        self.scrape_job.side_effect = slow_scrape
+        urls = [f'https://example.com/jobs/{n}' for n in range(6)]
+        with mock.patch.object(test_views, 'BATCH_CONCURRENCY', 2):
+            response = await self.post({'urls': urls})
+            body = b''.join([chunk async for chunk in response.streaming_content])
+
+        self.assertEqual(sorted(result['url'] for result in json.loads(body)['results']), sorted(urls))
+        self.assertLessEqual(running['peak'], 2)
+
+    async def test_batch_streams_results_in_completion_order(self):
+        def scrape(url):
+            if 'slow' in url:
+                time.sleep(0.2)
+            return fake_scrape(url)
+
+        self.scrape_job.side_effect = scrape
+        response = await self.post({'urls': ['https://example.com/slow', 'https://example.com/broken', 'https://example.com/fast']})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        body = json.loads(b''.join([chunk async for chunk in response.streaming_content]))
+        self.assertTrue(body['success'])
+        results = {result['url']: result for result in body['results']}
+        self.assertEqual(body['results'][-1]['url'], 'https://example.com/slow')
+        self.assertFalse(results['https://example.com/broken']['success'])
+        self.assertEqual(results['https://example.com/broken']['error'], "Connection reset")
+        self.assertTrue(results['https://example.com/fast']['success'])
+
+    async def test_response_is_gzipped_when_the_client_accepts_it(self):
+        response = await self.async_client.post(
+            reverse('jobassistant:test_scraping'), json.dumps({'url': 'https://example.com/jobs/1'}),
+            content_type='application/json', headers={'accept-encoding': 'gzip'}
+        )
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content))['url'], 'https://example.com/jobs/1')
+
+    @override_settings(STORAGES=PLAIN_STATIC_STORAGES)
+    def test_scraping_page_redirects_to_the_static_file(self):
+        response = self.client.get(reverse('jobassistant:test_scraping_page'))
+
+        self.assertRedirects(response, static('jobassistant/scraping_test.html'), fetch_redirect_response=False)
+
+
+class SafeExtractFieldTests(TestCase):
+    """safe_extract_field picks the first usable value among its field names"""
+
+    def test_strips_strings_and_skips_empty_values(self):
+        raw = {'salary': '  ', 'salary_range': None, 'salary_info': ' $120k '}
+
+        self.assertEqual(safe_data_utils.safe_extract_field(raw, ('salary', 'salary_range', 'salary_info')), '$120k')
+        self.assertEqual(safe_data_utils.safe_extract_field(raw, 'salary_info'), '$120k')
+        self.assertEqual(safe_data_utils.safe_extract_field(raw, ('missing',), 'n/a'), 'n/a')
+
+    def test_stringifies_other_values_but_not_null_placeholders(self):
+        self.assertEqual(safe_data_utils.safe_extract_field({'count': 0}, ('count',)), '0')
+        self.assertEqual(safe_data_utils.safe_extract_field({'tags': ['a']}, ('tags',)), "['a']")
+        for placeholder in ('None', 'null', 'UNDEFINED'):
+            value = type('Placeholder', (), {'__str__': lambda self, text=placeholder: text})()
+            with self.subTest(placeholder=placeholder):
+                self.assertEqual(safe_data_utils.safe_extract_field({'value': value}, ('value',), 'n/a'), 'n/a')
+
+    def test_literal_placeholder_strings_are_kept(self):
+        # Only non-string values are screened for placeholders, as before
+        self.assertEqual(safe_data_utils.safe_extract_field({'company': 'null'}, ('company',)), 'null')
+
+
+class CleanJobDataTests(TestCase):
+    """clean_job_data and get_safe_job_data_for_save never hand None to the model"""
+
+    def test_short_critical_fields_fall_back_to_placeholders(self):
+        cleaned = safe_data_utils.clean_job_data({'title': ' QA ', 'company': 'X', 'location': 'L'}, 'https://example.com/1')
+
+        self.assertEqual(cleaned['title'], 'Job Title Not Available')
+        self.assertEqual(cleaned['company'], 'Company Not Available')
+        self.assertEqual(cleaned['location'], 'Location Not Available')
+
+        cleaned = safe_data_utils.clean_job_data({'title': 'Dev', 'company': 'HP', 'location': 'NZ'}, 'https://example.com/1')
+        self.assertEqual((cleaned['title'], cleaned['company'], cleaned['location']), ('Dev', 'HP', 'NZ'))
+
+    def test_saved_job_data_has_no_none_values(self):
+        job_data = {'title': None, 'salary_info': '$100k', 'needs_review': None}
+
+        cleaned = safe_data_utils.get_safe_job_data_for_save(job_data, 'https://WWW.Seek.com.au/job/1', 'selenium_enhanced')
+
+        self.assertNotIn(None, cleaned.values())
+        self.assertEqual(cleaned['title'], 'Job Title Not Available')
+        self.assertEqual(cleaned['salary_range'], '$100k')
+        self.assertEqual(cleaned['description'], 'Job description not extracted')
+        self.assertEqual(cleaned['site_domain'], 'www.seek.com.au')
+        self.assertEqual((cleaned['scraping_method'], cleaned['extraction_method']), ('selenium_enhanced', 'selenium'))
+        self.assertIs(cleaned['needs_review'], False)
+        self.assertEqual(cleaned['url'], 'https://WWW.Seek.com.au/job/1')
+
+
+class SiteSelectorTests(TestCase):
+    """Precompiled per-site selectors keep their priority order over document order"""
+
+    html = (
+        '<div class="company">Globex</div>'
+        '<h1 class="job-title">Posted yesterday</h1>'
+        '<h1 class="t-24 t-bold inline">Backend Engineer</h1>'
+        '<span class="jobs-unified-top-card__bullet">Sydney, NSW</span>'
+        '<div class="jobs-description-content__text"> </div>'
+        '<div class="jobs-box__html-content">Build services</div>'
+    )
+
+    def setUp(self):
+        super().setUp()
+        # The constructor starts browser-backed scrapers; parsing needs none of them
+        self.service = JobScrapingService.__new__(JobScrapingService)
+
+    def parse(self, parser):
+        job_data = parser(BeautifulSoup(self.html, 'html.parser'))
+        return {field: job_data[field] for field in ('title', 'company', 'location', 'description')}
+
+    def test_site_selectors_follow_priority_and_skip_empty_matches(self):
+        self.assertEqual(self.parse(self.service._parse_linkedin_job), {
+            'title': 'Backend Engineer', 'company': '', 'location': 'Sydney, NSW', 'description': 'Build services',
+        })
+
+    def test_generic_selectors_take_the_first_element_each_selector_matches(self):
+        self.assertEqual(self.parse(self.service._parse_generic_job), {
+            'title': 'Posted yesterday', 'company': 'Globex', 'location': '', 'description': '',
+        })
+
+    def test_selenium_scrape_loads_eagerly_and_parses_after_a_title_timeout(self):
+        driver = mock.Mock(page_source=self.html)
+        with mock.patch.object(scraping_service.webdriver, 'Chrome', return_value=driver) as chrome, \
+                mock.patch.object(scraping_service, 'WebDriverWait') as wait:
+            wait.return_value.until.side_effect = scraping_service.TimeoutException()
+            job_data = self.service._scrape_with_selenium('https://www.linkedin.com/jobs/view/1')
+
+        options = chrome.call_args.kwargs['options']
+        self.assertEqual(options.page_load_strategy, 'eager')
+        self.assertIn('--headless=new', options.arguments)
+        self.assertEqual(job_data['title'], 'Backend Engineer')
+        condition = wait.return_value.until.call_args.args[0]
+        driver.find_element.return_value = mock.sentinel.title
+        self.assertIs(condition(driver), mock.sentinel.title)
+        driver.find_element.assert_called_with('css selector', 'h1, [data-test="job-title"]')
+        driver.quit.assert_called_once_with()
+
+
+class AutoSaveSectionTests(TestCase):
+    """auto_save_section writes only the columns a request changes"""
+
+    def setUp(self):
+        super().setUp()
+        self.profile = make_profile(address_line_1='1 Queen Street', state_region='Auckland', postal_code='1010')
+
+    def post(self, data):
+        request = RequestFactory().post('/api/cv/auto-save/', {'profile_id': self.profile.id, 'section': 'personal', **data})
+        with CaptureQueriesContext(connection) as queries:
+            response = views_new.auto_save_section(request)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        return json.loads(response.content), updates
+
+    def test_single_field_updates_only_that_column(self):
+        data, updates = self.post({'field': 'city', 'value': 'Wellington'})
+
+        self.assertTrue(data['success'])
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"city"', updates[0])
+        self.assertNotIn('"first_name"', updates[0])
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.city, 'Wellington')
+
+    def test_single_field_is_validated(self):
+        data, updates = self.post({'field': 'email', 'value': 'not-an-email'})
+
+        self.assertFalse(data['success'])
+        self.assertIn('email', data['errors'])
+        self.assertEqual(updates, [])
+
+        data, updates = self.post({'field': 'session_key', 'value': 'stolen'})
+        self.assertEqual(data['error'], 'Unknown field')
+
+    def test_whole_section_writes_only_changed_fields(self):
+        fields = views_new.PersonalInfoForm.base_fields
+        current = {name: value for name, value in model_to_dict(self.profile, fields=fields).items() if value is not None}
+
+        data, updates = self.post(current)
+        self.assertTrue(data['success'])
+        self.assertEqual(updates, [])
+
+        data, updates = self.post({**current, 'last_name': 'Smith'})
+        self.assertTrue(data['success'])
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"last_name"', updates[0])
+        self.assertNotIn('"email"', updates[0])
+
+
+class CalculateCompletionTests(TestCase):
+    """calculate_completion scores the profile in one read and one write"""
+
+    def completion(self, profile):
+        request = RequestFactory().get('/api/cv/completion/')
+        with CaptureQueriesContext(connection) as queries:
+            response = views_new.calculate_completion(request, profile.id)
+        return json.loads(response.content), len(queries)
+
+    def test_scores_sections_with_one_select_and_one_update(self):
+        profile = make_profile()
+        updated_at = profile.updated_at
+
+        data, query_count = self.completion(profile)
+
+        # Personal info, work experience and skills out of eight sections
+        self.assertEqual((data['completed_sections'], data['percentage']), (3, 37))
+        self.assertEqual(query_count, 2)
+        profile.refresh_from_db()
+        self.assertEqual(profile.profile_completion_percentage, 37)
+        self.assertEqual(profile.updated_at, updated_at)
+
+    def test_any_additional_section_counts_once(self):
+        profile = make_profile()
+        Award.objects.create(profile=profile, name='Hackathon winner', issuing_organization='Acme', date_received=date(2023, 5, 1))
+
+        self.assertEqual(self.completion(profile)[0]['completed_sections'], 4)
+
+    def test_unknown_profile_is_404(self):
+        with self.assertRaises(Http404):
+            self.completion(UserProfile(id=uuid.uuid4()))
+
+
+@override_settings(STORAGES=PLAIN_STATIC_STORAGES)
+class ManualEntryPageTests(TestCase):
+    """The manual entry pages post back to their own handlers wherever they are rendered"""
+
+    failed_url = 'https://www.linkedin.com/jobs/view/123'
+
+    def test_manual_job_entry_page(self):
+        response = self.client.get(reverse('jobassistant:manual_job_entry'), {'url': self.failed_url, 'reason': 'Blocked'})
+
+        self.assertEqual(response.context['failed_url'], self.failed_url)
+        self.assertEqual(response.context['failed_reason'], 'Blocked')
+        self.assertContains(response, f'action="{reverse("jobassistant:manual_job_entry")}"')
+
+    def test_enhanced_manual_entry_page(self):
+        response = self.client.get(reverse('jobassistant:enhanced_manual_entry'), {'url': self.failed_url})
+
+        self.assertTrue(response.context['is_linkedin'])
+        self.assertEqual(response.context['failed_reason'], 'Automatic scraping failed')
+        self.assertContains(response, f'action="{reverse("jobassistant:enhanced_manual_entry")}"')
+
+
+class RenderFilesTests(TestCase):
+    """_render_files renders the requested formats, at most RENDER_WORKERS at a time"""
+
+    def make_generator(self):
+        lock = threading.Lock()
+        self.running = {'now': 0, 'peak': 0}
+
+        def renderer(extension):
+            def render(content, doc_type, full_name):
+                with lock:
+                    self.running['now'] += 1
+                    self.running['peak'] = max(self.running['peak'], self.running['now'])
+                time.sleep(0.02)
+                with lock:
+                    self.running['now'] -= 1
+                return f'generated/{doc_type}.{extension}'
+            return render
+
+        return mock.Mock(generate_pdf=renderer('pdf'), generate_docx=renderer('docx'))
+
+    def test_renders_only_requested_formats(self):
+        generator = self.make_generator()
+
+        self.assertEqual(tasks._render_files(generator, 'text', 'resume', 'Jane Doe', 'pdf'), {'pdf': 'generated/resume.pdf'})
+        self.assertEqual(tasks._render_files(generator, 'text', 'resume', 'Jane Doe', None), {})
+
+    def test_both_formats_respect_the_worker_cap(self):
+        generator = self.make_generator()
+
+        with mock.patch.object(tasks, 'RENDER_WORKERS', 1):
+            files = tasks._render_files(generator, 'text', 'cover_letter', 'Jane Doe', 'both')
+
+        self.assertEqual(files, {'pdf': 'generated/cover_letter.pdf', 'docx': 'generated/cover_letter.docx'})
+        self.assertEqual(self.running['peak'], 1)
+
+
+class ServiceAccessorTests(TestCase):
+    """Service accessors hand out one instance per process and mode"""
+
+    def test_accessors_reuse_their_instance(self):
+        self.assertIs(services.get_document_generator(), services.get_document_generator())
+        self.assertIs(services.get_resume_parser(), services.get_resume_parser(False))
+        self.assertIs(services.get_content_generator(), services.get_content_generator(use_paid=False))
+
+    def test_free_and_paid_modes_get_separate_instances(self):
+        with mock.patch('jobassistant.services.parsing_service.ResumeParsingService') as parser_class:
+            services._build_resume_parser.cache_clear()
+            self.addCleanup(services._build_resume_parser.cache_clear)
+            services.get_resume_parser()
+            services.get_resume_parser(False)
+            services.get_resume_parser(True)
+            services.get_resume_parser(use_paid=True)
+
+        self.assertEqual(parser_class.call_args_list, [mock.call(use_paid_apis=False), mock.call(use_paid_apis=True)])
+
+
+class ProgressTaskIdTests(ProgressCacheMixin, TestCase):
+    """Generated task IDs are unique and reachable through the progress URL"""
+
+    def test_generated_ids_are_unique_hex_tokens(self):
+        task_ids = {ProgressTracker().task_id for _ in range(1000)}
+
+        self.assertEqual(len(task_ids), 1000)
+        self.assertTrue(all(len(task_id) == 24 and int(task_id, 16) >= 0 for task_id in task_ids))
+
+    def test_generated_id_resolves_through_get_progress(self):
+        tracker = ProgressTracker()
+        tracker.update(10, "Validating URL...")
+
+        response = self.client.get(reverse('jobassistant:get_progress', args=[tracker.task_id]))
+
+        self.assertEqual(response.json()['task_id'], tracker.task_id)
+
+
+class DebugProgressTests(ProgressCacheMixin, TestCase):
+    """debug_progress reports which test progress keys are cached"""
+
+    def test_reports_cached_test_keys_with_one_get_many(self):
+        ProgressTracker('test-task-1').update(10, "Validating URL...")
+        ProgressTracker('test-task-3').update(10, "Validating URL...")
+
+        with mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            response = self.client.get(reverse('jobassistant:debug_progress'))
+
+        get_many.assert_called_once_with([f'progress_test-task-{i}' for i in range(5)])
+        self.assertEqual(
+            response.json()['cache_info']['test_keys_found'],
+            ['progress_test-task-1', 'progress_test-task-3']
+        )
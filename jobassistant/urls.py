@@ -1,4 +1,5 @@
-from django.urls import path
+from django.urls import path, register_converter
+from . import converters
 from . import views
 from . import test_views
 from . import manual_views
@@ -6,7 +7,14 @@ from . import cv_views
 
 app_name = 'jobassistant'
 
+register_converter(converters.TaskIdConverter, 'task_id')
+
 urlpatterns = [
+    # Polled every ~500ms by the progress tracker JS - kept first so the resolver
+    # matches them before scanning the page routes
+    path('api/progress/<task_id:task_id>/', views.get_progress, name='get_progress'),
+    path('api/scraping-status/<uuid:session_id>/', views.check_scraping_status, name='check_scraping_status'),
+    
     # Main pages
     path('', views.HomeView.as_view(), name='home'),
     path('about/', views.about, name='about'),
@@ -55,18 +63,14 @@ urlpatterns = [
     path('settings/', views.settings_view, name='settings'),
     path('clear-session/', views.clear_session, name='clear_session'),
     
-    # API endpoints
-    path('api/scraping-status/<uuid:session_id>/', views.check_scraping_status, name='check_scraping_status'),
-    
     # CV-First API endpoints
     path('api/cv/save-wizard-step/', cv_views.save_wizard_step, name='save_wizard_step'),
     path('api/cv/upload-with-progress/', cv_views.upload_cv_with_progress, name='upload_cv_with_progress'),
     
     # Progress tracking API endpoints
-    path('api/progress/<str:task_id>/', views.get_progress, name='get_progress'),
     path('api/progress-debug/', views.debug_progress, name='debug_progress'),
     path('api/create-test-progress/', views.create_test_progress, name='create_test_progress'),
-    path('api/recover-progress/<str:task_id>/', views.recover_progress, name='recover_progress'),
+    path('api/recover-progress/<task_id:task_id>/', views.recover_progress, name='recover_progress'),
     path('api/scrape-with-progress/', views.scrape_job_with_progress, name='scrape_job_with_progress'),
     path('api/parse-resume-with-progress/', views.parse_resume_with_progress, name='parse_resume_with_progress'),
     path('api/generate-documents-with-progress/', views.generate_documents_with_progress, name='generate_documents_with_progress'),
@@ -3,22 +3,92 @@ Progress tracking utilities for AutoCraftCV
 Handles real-time progress updates for long-running operations
 """
 
-import json
+import os
+import random
+import threading
 import time
-import uuid
+import orjson
+from array import array
+from bisect import bisect_left
 from django.core.cache import cache
 from django.conf import settings
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import logging
 
+from .models import ProgressTask
+
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between database backups of in-flight progress
+DB_FLUSH_INTERVAL = 2.0
+
+# A Redis cache is shared by every web and Celery process and outlives them, so
+# in-flight progress needs no database copy - only each task's outcome is recorded
+SHARED_PROGRESS_CACHE = 'redis' in settings.CACHES['default']['BACKEND'].lower()
+
+# Cache progress for 30 minutes (extended for longer operations)
+PROGRESS_CACHE_TIMEOUT = 1800
+
+
+# In-process micro-cache in front of the shared cache - absorbs tight polling loops
+LOCAL_PROGRESS_TTL = 0.1
+LOCAL_PROGRESS_MAXSIZE = 4096
+
+_local_progress: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_local_progress_lock = threading.Lock()
+
+
+def _remember_progress(task_id: str, progress_data: Dict[str, Any]):
+    """Keep progress in the in-process micro-cache for LOCAL_PROGRESS_TTL seconds"""
+    with _local_progress_lock:
+        if len(_local_progress) >= LOCAL_PROGRESS_MAXSIZE and task_id not in _local_progress:
+            # Entries only live for a fraction of a second - dropping them all is cheap
+            _local_progress.clear()
+        _local_progress[task_id] = (time.monotonic() + LOCAL_PROGRESS_TTL, progress_data)
+
+
+def _recall_progress(task_id: str) -> Optional[Dict[str, Any]]:
+    """Return micro-cached progress if it is still fresh"""
+    with _local_progress_lock:
+        entry = _local_progress.get(task_id)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _write_progress(task_id: str, progress_data: Dict[str, Any]):
+    """Store progress in cache as pre-serialized orjson bytes"""
+    cache.set(f'progress_{task_id}', orjson.dumps(progress_data, default=str), timeout=PROGRESS_CACHE_TIMEOUT)
+    _remember_progress(task_id, progress_data)
+
+
+def _read_progress(task_id: str) -> Optional[Dict[str, Any]]:
+    """Load progress written by _write_progress, or None if not cached"""
+    progress_data = _recall_progress(task_id)
+    if progress_data:
+        return progress_data
+    
+    blob = cache.get(f'progress_{task_id}')
+    if not blob:
+        return None
+    
+    progress_data = orjson.loads(blob)
+    _remember_progress(task_id, progress_data)
+    return progress_data
+
 
 class ProgressTracker:
     """Utility class for tracking progress of long-running operations"""
     
+    __slots__ = (
+        'task_id', 'total_steps', 'current_step', 'status', 'stage', 'completed',
+        'error_message', 'additional_data', 'start_time',
+        '_last_db_flush', '_last_snapshot', '_last_payload',
+    )
+    
     def __init__(self, task_id: Optional[str] = None, total_steps: int = 100):
-        self.task_id = task_id or str(uuid.uuid4())
+        # 96 random bits as hex - no UUID object; ample for a 30-minute cache lifetime
+        self.task_id = task_id or os.urandom(12).hex()
         self.total_steps = total_steps
         self.current_step = 0
         self.status = "Initializing..."
@@ -26,7 +96,10 @@ class ProgressTracker:
         self.completed = False
         self.error_message = None
         self.additional_data = {}
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
+        self._last_db_flush = 0.0
+        self._last_snapshot = None
+        self._last_payload = None
         
     def update(self, step: int, status: str, stage: Optional[str] = None, error: Optional[str] = None):
         """Update progress information"""
@@ -38,14 +111,20 @@ class ProgressTracker:
             self.error_message = error
             self.completed = True
         
-        # Calculate progress percentage
-        progress = int((self.current_step / self.total_steps) * 100)
+        # Calculate progress percentage (integer math, no float round-trip)
+        progress = (self.current_step * 100) // self.total_steps
+        completed = self.completed or progress >= 100
+        
+        # Nothing visible changed since the last tick - skip the cache/DB writes
+        snapshot = (progress, self.status, self.stage, completed)
+        if snapshot == self._last_snapshot:
+            return self._last_payload
         
         # Estimate remaining time
-        elapsed_time = time.time() - self.start_time
+        elapsed_time = time.monotonic() - self.start_time
         if self.current_step > 0:
-            estimated_total = elapsed_time * (self.total_steps / self.current_step)
-            estimated_remaining = max(0, int(estimated_total - elapsed_time))
+            remaining_steps = self.total_steps - self.current_step
+            estimated_remaining = max(0, int(elapsed_time * remaining_steps / self.current_step))
         else:
             estimated_remaining = None
         
@@ -56,40 +135,60 @@ class ProgressTracker:
             'status': self.status,
             'stage': self.stage,
             'error': self.error_message,
-            'completed': self.completed or progress >= 100,
+            'completed': completed,
             'elapsed_time': int(elapsed_time),
             'estimated_remaining': estimated_remaining,
             'timestamp': time.time(),
             **self.additional_data  # Include any additional data
         }
+        self._last_snapshot = snapshot
+        self._last_payload = progress_data
         
-        # Cache for 30 minutes (extended for longer operations)
-        cache.set(f'progress_{self.task_id}', progress_data, timeout=1800)
+        _write_progress(self.task_id, progress_data)
+        
+        # Also store in database as backup - throttled so fast-ticking tasks don't
+        # pay a round-trip per update (skipped entirely behind Redis); terminal
+        # states are always flushed
+        now = time.monotonic()
+        if completed or (not SHARED_PROGRESS_CACHE and now - self._last_db_flush > DB_FLUSH_INTERVAL):
+            self._last_db_flush = now
+            self._persist(progress, completed)
+        
+        return progress_data
+    
+    def _persist(self, progress: int, completed: bool):
+        """Write current progress to the ProgressTask backup table"""
+        if self.error_message:
+            task_status = 'failed'
+        elif completed:
+            task_status = 'completed'
+        else:
+            task_status = 'processing'
         
-        # Also store in database as backup
         try:
-            from .models import ProgressTask
-            task, created = ProgressTask.objects.get_or_create(
+            ProgressTask.objects.update_or_create(
                 task_id=self.task_id,
                 defaults={
-                    'task_type': 'other',
+                    'status': task_status,
                     'progress': progress,
-                    'status_message': self.status,
-                    'stage': self.stage,
-                    'error_message': self.error_message,
-                    'additional_data': self.additional_data
+                    'current_step': self.status[:100],
+                    'result_data': {'stage': self.stage, **self.additional_data},
+                    'error_message': self.error_message or '',
                 }
             )
-            if not created:
-                task.update_progress(progress, self.status, self.stage)
-                if self.error_message:
-                    task.mark_failed(self.error_message)
-                elif progress >= 100:
-                    task.mark_completed(self.status)
         except Exception as e:
             logger.warning(f"Failed to store progress in database: {e}")
+    
+    def mark_queued(self, status: str = "Queued..."):
+        """Publish a task that another process (a Celery worker) will run"""
+        if SHARED_PROGRESS_CACHE:
+            return self.update(0, status)
         
-        return progress_data
+        # The worker's cache writes can't reach this process's cache, so an entry here
+        # would pin the poller at "queued" - record it in the database only
+        self.status = status
+        self._persist(0, False)
+        return None
     
     def complete(self, status: str = "Complete!", additional_data: Optional[Dict[str, Any]] = None):
         """Mark task as completed with optional additional data"""
@@ -107,18 +206,31 @@ class ProgressTracker:
     def get_progress(cls, task_id: str) -> Optional[Dict[str, Any]]:
         """Get current progress for a task (try cache first, then database)"""
         # Try cache first
-        progress_data = cache.get(f'progress_{task_id}')
+        progress_data = _read_progress(task_id)
         if progress_data:
             return progress_data
         
         # Fallback to database
         try:
-            from .models import ProgressTask
             task = ProgressTask.objects.get(task_id=task_id)
-            progress_data = task.to_dict()
+            result_data = dict(task.result_data)
+            progress_data = {
+                'task_id': task_id,
+                'progress': task.progress,
+                'status': task.current_step,
+                'stage': result_data.pop('stage', ''),
+                'error': task.error_message or None,
+                'completed': task.status in ('completed', 'failed'),
+                'elapsed_time': int((task.updated_at - task.created_at).total_seconds()),
+                'estimated_remaining': None,
+                'timestamp': task.updated_at.timestamp(),
+                **result_data
+            }
             
-            # Restore to cache
-            cache.set(f'progress_{task_id}', progress_data, timeout=1800)
+            # Restore to cache - finished tasks only: an in-flight snapshot cached here
+            # would hide the newer rows a worker in another process keeps writing
+            if progress_data['completed']:
+                _write_progress(task_id, progress_data)
             return progress_data
         except Exception as e:
             logger.debug(f"Progress not found in database for task {task_id}: {e}")
@@ -128,12 +240,33 @@ class ProgressTracker:
     def cleanup_progress(cls, task_id: str):
         """Remove progress data from cache"""
         cache.delete(f'progress_{task_id}')
+        with _local_progress_lock:
+            _local_progress.pop(task_id, None)
+
+
+class ProgressStages:
+    """Base for predefined stage tables - derives bisect-ready lookups from STAGES"""
+    
+    STAGES: Tuple[Tuple[int, str, str], ...] = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Parallel arrays so stage lookup is a binary search over packed ints
+        cls.THRESHOLDS = array('H', (threshold for threshold, _, _ in cls.STAGES))
+        cls.MESSAGES = tuple(message for _, message, _ in cls.STAGES)
+        cls.STAGE_LABELS = tuple(label for _, _, label in cls.STAGES)
+    
+    @classmethod
+    def stage_for(cls, progress: int) -> Tuple[str, str]:
+        """Return (message, stage label) of the first stage whose threshold is >= progress"""
+        index = min(bisect_left(cls.THRESHOLDS, progress), len(cls.THRESHOLDS) - 1)
+        return cls.MESSAGES[index], cls.STAGE_LABELS[index]
 
 
-class JobScrapingProgress:
+class JobScrapingProgress(ProgressStages):
     """Predefined progress stages for job scraping"""
     
-    STAGES = [
+    STAGES = (
         (5, "Validating URL...", "1/6"),
         (15, "Fetching job page...", "2/6"),
         (35, "Parsing HTML content...", "3/6"),
@@ -141,13 +274,13 @@ class JobScrapingProgress:
         (80, "Processing requirements...", "5/6"),
         (95, "Structuring data...", "6/6"),
         (100, "Complete!", "6/6")
-    ]
+    )
 
 
-class ResumeParsingProgress:
+class ResumeParsingProgress(ProgressStages):
     """Predefined progress stages for resume parsing"""
     
-    STAGES = [
+    STAGES = (
         (10, "Uploading file...", "1/6"),
         (25, "Validating file format...", "2/6"),
         (45, "Extracting text content...", "3/6"),
@@ -155,24 +288,23 @@ class ResumeParsingProgress:
         (85, "Structuring data...", "5/6"),
         (95, "Finalizing profile...", "6/6"),
         (100, "Complete!", "6/6")
-    ]
+    )
 
 
-class AIGenerationProgress:
+class AIGenerationProgress(ProgressStages):
     """Predefined progress stages for AI content generation"""
     
-    STAGES = [
+    STAGES = (
         (10, "Analyzing job posting...", "1/5"),
         (30, "Processing user profile...", "2/5"),
         (60, "Generating content...", "3/5"),
         (85, "Formatting output...", "4/5"),
         (95, "Finalizing documents...", "5/5"),
         (100, "Complete!", "5/5")
-    ]
+    )
 
 
 def simulate_progress_delay(min_delay: float = 0.5, max_delay: float = 2.0):
     """Add realistic delay for progress updates"""
-    import random
     delay = random.uniform(min_delay, max_delay)
     time.sleep(delay)
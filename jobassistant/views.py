@@ -1,7 +1,64 @@
-from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.shortcuts import render, redirect, get_object_or_404
+from django.http import JsonResponse, HttpResponseNotModified, FileResponse, Http404
+from django.conf import settings
 from django.contrib import messages
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db.models.functions import Left
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 from django.views.generic import TemplateView
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from asgiref.sync import sync_to_async
+import hashlib
+import json
+import logging
+import os
+import uuid
+
+from .forms import DocumentGenerationForm
+from .models import GeneratedDocument, UserProfile
+from .tasks import (
+    RESUME_UPLOAD_DIR, document_files_error_key, generate_documents_task,
+    generate_selected_documents_task, parse_resume_task,
+)
+from .utils import ProgressTracker
+
+logger = logging.getLogger(__name__)
+
+# Columns the download page displays for each generated document
+DOWNLOAD_DOC_FIELDS = (
+    'id', 'document_type', 'title', 'generation_method', 'generation_time',
+    'created_at', 'pdf_file', 'docx_file',
+)
+
+# The page previews the first 50 words of each document; this many characters
+# comfortably covers them without pulling whole documents from the DB
+DOWNLOAD_PREVIEW_CHARS = 1000
+
+def _ensure_session_key(request):
+    """Session key for this request, creating the session first if needed"""
+    if not request.session.session_key:
+        request.session.create()
+    return request.session.session_key
+
+def _session_profile_id(request):
+    """ID of this visitor's CV profile - the same lookup the CV builder views use"""
+    if request.user.is_authenticated:
+        profiles = UserProfile.objects.filter(user=request.user)
+    elif request.session.session_key:
+        profiles = UserProfile.objects.filter(session_key=request.session.session_key)
+    else:
+        return None
+    return profiles.values_list('id', flat=True).first()
+
+def _queue_progress_task(task, task_id, *args):
+    """Queue a Celery task that reports through ProgressTracker(task_id)"""
+    # Published first so get_progress can see the task before a worker picks it up
+    ProgressTracker(task_id).mark_queued()
+    task.delay(task_id, *args)
 
 # Temporary minimal views for migration
 class HomeView(TemplateView):
@@ -61,19 +118,105 @@ def document_options(request):
     return redirect('jobassistant:home')
 
 def generate_documents(request):
-    """Temporary generate documents view"""
-    messages.info(request, 'Document generation feature will be available soon.')
-    return redirect('jobassistant:home')
+    """Start document generation on a worker and show its progress"""
+    if request.method != 'POST':
+        return redirect('jobassistant:home')
+    
+    # The job comes from the job entry views, the profile from the CV builder
+    job_id = request.session.get('current_job_id')
+    profile_id = _session_profile_id(request)
+    if not (job_id and profile_id):
+        messages.error(request, 'Please add a job posting and create your CV profile first.')
+        return redirect('jobassistant:home')
+    
+    form = DocumentGenerationForm(request.POST)
+    if not form.is_valid():
+        messages.error(request, 'Please choose which documents to generate and an output format.')
+        return redirect('jobassistant:home')
+    
+    # The LLM calls take several seconds - run them on the generate queue and let the
+    # page poll get_progress instead of holding this worker
+    use_paid = getattr(settings, 'APP_VERSION', 'free') == 'paid'
+    task_id = str(uuid.uuid4())
+    _queue_progress_task(generate_documents_task, task_id, job_id, str(profile_id), form.cleaned_data, use_paid)
+    
+    return render(request, 'jobassistant/generating_wait.html', {'task_id': task_id})
+
+def _download_documents_etag(request):
+    doc_ids = request.session.get('generated_doc_ids')
+    # A ?task= visit swaps in a new set of documents, and queued flash messages must
+    # not hide behind a 304
+    if not doc_ids or 'task' in request.GET or len(messages.get_messages(request)):
+        return None
+    # Files (or a failure to write them) land after the page first renders
+    # (generate_document_files_task), so both are part of the tag
+    rows = GeneratedDocument.objects.filter(id__in=doc_ids).values_list('id', 'pdf_file', 'docx_file').order_by('id')
+    failed = cache.get_many([document_files_error_key(doc_id) for doc_id in doc_ids])
+    payload = '|'.join(str(part) for part in (*rows, *sorted(failed)))
+    return hashlib.sha256(payload.encode()).hexdigest()
 
+@condition(etag_func=_download_documents_etag)
 def download_documents(request):
-    """Temporary download documents view"""
-    messages.info(request, 'Document download feature will be available soon.')
-    return redirect('jobassistant:home')
+    """Display generated documents and download links"""
+    task_id = request.GET.get('task')
+    if task_id:
+        # Arriving from generating_wait.html - adopt the finished task's documents
+        progress_data = ProgressTracker.get_progress(task_id)
+        profile_id = _session_profile_id(request)
+        if progress_data and progress_data.get('document_ids') and profile_id:
+            # Only documents generated for this visitor's own profile - a shared or
+            # guessed ?task= link must not expose someone else's CV
+            owned_ids = [
+                str(doc_id) for doc_id in GeneratedDocument.objects.filter(
+                    id__in=progress_data['document_ids'], user_profile_id=profile_id,
+                ).values_list('id', flat=True)
+            ]
+            if owned_ids:
+                request.session['generated_doc_ids'] = owned_ids
+                messages.success(request, f"{progress_data['document_names']} generated successfully!")
+    
+    if 'generated_doc_ids' not in request.session:
+        messages.error(request, 'No documents available for download.')
+        return redirect('jobassistant:home')
+    
+    # The template only reads the documents' own columns - plain dicts of those
+    # columns replace full model instances
+    documents = list(GeneratedDocument.objects.filter(id__in=request.session['generated_doc_ids']).values(
+        *DOWNLOAD_DOC_FIELDS, content_preview=Left('content', DOWNLOAD_PREVIEW_CHARS)
+    ).order_by('document_type'))
+    
+    # Files the worker failed to write are reported rather than left "preparing"
+    files_errors = cache.get_many([document_files_error_key(doc['id']) for doc in documents])
+    for doc in documents:
+        doc['files_error'] = files_errors.get(document_files_error_key(doc['id']))
+    
+    return render(request, 'jobassistant/download_documents.html', {'documents': documents})
 
 def download_file(request, doc_id, file_type):
-    """Temporary download file view"""
-    messages.info(request, 'File download feature will be available soon.')
-    return redirect('jobassistant:home')
+    """Download generated file"""
+    # Only documents adopted into this session by download_documents
+    if str(doc_id) not in request.session.get('generated_doc_ids', []):
+        raise Http404("File not found")
+    
+    # Just the file columns - the response never needs the document's text
+    document = get_object_or_404(GeneratedDocument.objects.only('pdf_file', 'docx_file'), id=doc_id)
+    
+    # FileResponse streams in chunks instead of reading the whole file into memory
+    if file_type == 'pdf' and document.pdf_file:
+        return FileResponse(
+            document.pdf_file.open('rb'),
+            as_attachment=True,
+            filename=os.path.basename(document.pdf_file.name),
+            content_type='application/pdf'
+        )
+    elif file_type == 'docx' and document.docx_file:
+        return FileResponse(
+            document.docx_file.open('rb'),
+            as_attachment=True,
+            filename=os.path.basename(document.docx_file.name),
+            content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+        )
+    raise Http404("File not found")
 
 def toggle_version(request):
     """Temporary toggle version view"""
@@ -94,33 +237,157 @@ def check_scraping_status(request, session_id):
     """Temporary scraping status API"""
     return JsonResponse({'status': 'coming_soon', 'message': 'Scraping status API will be available soon.'})
 
-def get_progress(request, task_id):
-    """Temporary progress API"""
-    return JsonResponse({'status': 'coming_soon', 'message': 'Progress API will be available soon.'})
+def _progress_fingerprint(progress_data):
+    """Fields a poller reacts to - the timing fields alone don't make an update"""
+    fields = ('progress', 'status', 'stage', 'completed', 'error')
+    payload = '|'.join(str(progress_data.get(field)) for field in fields)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+@csrf_exempt
+async def get_progress(request, task_id):
+    """Get current progress for a task"""
+    try:
+        # Polled every ~500ms per client - don't hold a worker thread on the cache/DB read
+        progress_data = await sync_to_async(ProgressTracker.get_progress)(task_id)
+    except Exception as e:
+        logger.error(f"Error getting progress for task {task_id}: {str(e)}")
+        return JsonResponse({
+            'error': 'Server error',
+            'message': 'An error occurred while retrieving progress data'
+        }, status=500)
+    
+    if not progress_data:
+        logger.warning(f"Progress data not found for task_id: {task_id}")
+        return JsonResponse({
+            'error': 'Task not found',
+            'message': 'This task may have expired, been completed, or never existed',
+            'task_id': task_id
+        }, status=404)
+    
+    # Most polls land between ticks - answer those with a 304 and skip the JSON
+    etag = quote_etag(_progress_fingerprint(progress_data))
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = JsonResponse(progress_data)
+    # no-cache, not no-store - the browser keeps the body and revalidates it
+    response['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
 
+@csrf_exempt
 def debug_progress(request):
-    """Temporary debug progress API"""
-    return JsonResponse({'status': 'coming_soon', 'message': 'Debug progress API will be available soon.'})
+    """Debug endpoint to check active progress tasks"""
+    try:
+        # Try to get some info about cache
+        cache_info = {
+            'backend': str(type(cache)),
+            'sample_keys': []
+        }
+        
+        # Try to access cache keys if possible
+        try:
+            # Test with a known pattern - one get_many round-trip for all candidates
+            candidate_keys = [f'progress_test-task-{i}' for i in range(5)]  # Check a few test task IDs
+            found = cache.get_many(candidate_keys)
+            test_keys = [key for key in candidate_keys if found.get(key)]
+            
+            cache_info['test_keys_found'] = test_keys
+            cache_info['message'] = 'Cache is accessible'
+        except Exception as cache_error:
+            cache_info['message'] = f'Cache access error: {str(cache_error)}'
+        
+        return JsonResponse({
+            'status': 'ok',
+            'cache_info': cache_info,
+            'server_time': timezone.now().isoformat()
+        })
+    except Exception as e:
+        return JsonResponse({
+            'error': 'Debug error',
+            'details': str(e)
+        }, status=500)
 
 def create_test_progress(request):
     """Temporary create test progress API"""
     return JsonResponse({'status': 'coming_soon', 'message': 'Test progress API will be available soon.'})
 
+@csrf_exempt
 def recover_progress(request, task_id):
-    """Temporary recover progress API"""
-    return JsonResponse({'status': 'coming_soon', 'message': 'Recover progress API will be available soon.'})
+    """Attempt to recover progress for a failed task"""
+    progress_data = ProgressTracker.get_progress(task_id)
+    if progress_data:
+        return JsonResponse({
+            'status': 'found',
+            'progress_data': progress_data,
+            'message': 'Progress data found in cache'
+        })
+    
+    # Nothing recorded anywhere - hand the tracker JS a terminal error state to show
+    recovery_data = ProgressTracker(task_id=task_id, total_steps=6).update(
+        step=1,
+        status="Progress recovery - task may have failed",
+        stage="1/6",
+        error="Task data lost, possible server restart or timeout"
+    )
+    return JsonResponse({
+        'status': 'recovered',
+        'progress_data': recovery_data,
+        'message': 'Created recovery progress data for debugging'
+    })
 
 def scrape_job_with_progress(request):
     """Temporary scrape job with progress API"""
     return JsonResponse({'status': 'coming_soon', 'message': 'Scrape job with progress API will be available soon.'})
 
-def parse_resume_with_progress(request):
-    """Temporary parse resume with progress API"""
-    return JsonResponse({'status': 'coming_soon', 'message': 'Parse resume with progress API will be available soon.'})
+@csrf_exempt
+async def parse_resume_with_progress(request):
+    """Parse resume with real-time progress tracking"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST method required'}, status=405)
+    
+    if 'resume_file' not in request.FILES:
+        return JsonResponse({'error': 'No file uploaded'}, status=400)
+    
+    uploaded_file = request.FILES['resume_file']
+    
+    # The session, storage and broker calls below all block, so they run off the event loop
+    session_key = await sync_to_async(_ensure_session_key)(request)
+    
+    # The worker may run on another host - stage the upload in media storage and
+    # hand the task its path
+    file_path = await sync_to_async(default_storage.save)(f"{RESUME_UPLOAD_DIR}/{uploaded_file.name}", uploaded_file)
+    
+    task_id = str(uuid.uuid4())
+    await sync_to_async(_queue_progress_task)(parse_resume_task, task_id, file_path, uploaded_file.name, session_key)
+    
+    return JsonResponse({'task_id': task_id})
 
-def generate_documents_with_progress(request):
-    """Temporary generate documents with progress API"""
-    return JsonResponse({'status': 'coming_soon', 'message': 'Generate documents with progress API will be available soon.'})
+@csrf_exempt
+async def generate_documents_with_progress(request):
+    """Generate documents with real-time progress tracking"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST method required'}, status=405)
+    
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    
+    job_id = data.get('job_id')
+    document_types = data.get('document_types', [])
+    if not job_id or not document_types:
+        return JsonResponse({'error': 'Job ID and document types are required'}, status=400)
+    
+    # The session and broker calls block, so they run off the event loop
+    session_key = await sync_to_async(_ensure_session_key)(request)
+    task_id = str(uuid.uuid4())
+    await sync_to_async(_queue_progress_task)(
+        generate_selected_documents_task, task_id, job_id, document_types,
+        data.get('output_formats', []), data.get('custom_instructions', ''), session_key
+    )
+    
+    return JsonResponse({'task_id': task_id})
 
 def progress_test_page(request):
     """Temporary progress test page"""
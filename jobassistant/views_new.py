@@ -1,11 +1,16 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
+from django.http import JsonResponse, Http404
+from django.core.exceptions import ValidationError
 from django.contrib import messages
 from django.views.generic import TemplateView
 from django.db import transaction
+from django.db.models import Exists, OuterRef
 import uuid
 
-from .models import UserProfile, ProgressTask
+from .models import (
+    UserProfile, ProgressTask, WorkExperience, Education, Skill, Certification,
+    Project, Award, ProfessionalMembership, VolunteerWork, Reference
+)
 from .forms import (
     PersonalInfoForm, ProfessionalProfileForm,
     WorkExperienceFormSet, EducationFormSet, SkillFormSet, 
@@ -255,27 +260,50 @@ def add_work_experience(request):
     return JsonResponse({'success': False, 'error': 'Invalid request'})
 
 
+# Section -> (form, success message) for auto_save_section
+AUTO_SAVE_SECTIONS = {
+    'personal': (PersonalInfoForm, 'Personal info auto-saved'),
+    'professional': (ProfessionalProfileForm, 'Professional profile auto-saved'),
+}
+
+
 def auto_save_section(request):
-    """Auto-save section data via AJAX"""
+    """Auto-save section data via AJAX
+    
+    Posting ``field``/``value`` saves just that field; otherwise the whole section
+    form is validated and only the fields that changed are written.
+    """
     if request.method == 'POST':
         try:
             profile_id = request.POST.get('profile_id')
             section = request.POST.get('section')
             
-            profile = get_object_or_404(UserProfile, id=profile_id)
+            if section not in AUTO_SAVE_SECTIONS:
+                return JsonResponse({'success': False, 'error': 'Validation failed'})
+            form_class, message = AUTO_SAVE_SECTIONS[section]
             
-            # Handle different sections
-            if section == 'personal':
-                form = PersonalInfoForm(request.POST, instance=profile)
-                if form.is_valid():
-                    form.save()
-                    return JsonResponse({'success': True, 'message': 'Personal info auto-saved'})
+            field = request.POST.get('field')
+            if field:
+                # Single dirty field - validate it alone and update that one column
+                if field not in form_class.base_fields:
+                    return JsonResponse({'success': False, 'error': 'Unknown field'})
+                try:
+                    value = form_class.base_fields[field].clean(request.POST.get('value'))
+                    UserProfile._meta.get_field(field).run_validators(value)
+                except ValidationError as e:
+                    return JsonResponse({'success': False, 'errors': {field: e.messages}})
+                
+                profile = get_object_or_404(UserProfile.objects.only('id'), id=profile_id)
+                setattr(profile, field, value)
+                profile.save(update_fields=[field, 'updated_at'])
+                return JsonResponse({'success': True, 'message': message})
             
-            elif section == 'professional':
-                form = ProfessionalProfileForm(request.POST, instance=profile)
-                if form.is_valid():
-                    form.save()
-                    return JsonResponse({'success': True, 'message': 'Professional profile auto-saved'})
+            profile = get_object_or_404(UserProfile, id=profile_id)
+            form = form_class(request.POST, instance=profile)
+            if form.is_valid():
+                if form.changed_data:
+                    form.save(commit=False).save(update_fields=form.changed_data + ['updated_at'])
+                return JsonResponse({'success': True, 'message': message})
             
             return JsonResponse({'success': False, 'error': 'Validation failed'})
             
@@ -285,55 +313,58 @@ def auto_save_section(request):
     return JsonResponse({'success': False, 'error': 'Invalid request'})
 
 
+def _has_rows(model):
+    """Exists() over model's rows belonging to the outer profile"""
+    return Exists(model.objects.filter(profile=OuterRef('pk')))
+
+
 def calculate_completion(request, profile_id):
     """Calculate CV completion percentage"""
-    profile = get_object_or_404(UserProfile, id=profile_id)
+    # One query for both the profile's own fields and whether each related section
+    # has entries, instead of an .exists() round-trip per section
+    profile = UserProfile.objects.filter(id=profile_id).annotate(
+        has_work=_has_rows(WorkExperience),
+        has_education=_has_rows(Education),
+        has_skills=_has_rows(Skill),
+        has_additional=(
+            _has_rows(Certification) | _has_rows(Project) | _has_rows(Award) |
+            _has_rows(ProfessionalMembership) | _has_rows(VolunteerWork)
+        ),
+        has_references=_has_rows(Reference),
+    ).values(
+        'first_name', 'last_name', 'email', 'mobile_phone', 'city', 'professional_summary',
+        'address_line_1', 'state_region', 'country', 'postal_code',
+        'has_work', 'has_education', 'has_skills', 'has_additional', 'has_references',
+    ).first()
+    if profile is None:
+        raise Http404('No UserProfile matches the given query.')
     
     # Calculate completion based on filled fields
     total_sections = 8
-    completed_sections = 0
-    
-    # Personal info (required fields)
-    if (profile.first_name and profile.last_name and profile.email and 
-        profile.mobile_phone and profile.city):
-        completed_sections += 1
-    
-    # Professional profile
-    if profile.professional_summary:
-        completed_sections += 1
-    
-    # Work experience
-    if profile.work_experiences.exists():
-        completed_sections += 1
-    
-    # Education
-    if profile.education_entries.exists():
-        completed_sections += 1
-    
-    # Skills
-    if profile.skills.exists():
-        completed_sections += 1
-    
-    # At least one additional section
-    if (profile.certifications.exists() or profile.projects.exists() or 
-        profile.awards.exists() or profile.memberships.exists() or 
-        profile.volunteer_work.exists()):
-        completed_sections += 1
-    
-    # References
-    if profile.references.exists():
-        completed_sections += 1
-    
-    # Contact details complete
-    if (profile.address_line_1 and profile.state_region and 
-        profile.country and profile.postal_code):
-        completed_sections += 1
+    sections = (
+        # Personal info (required fields)
+        profile['first_name'] and profile['last_name'] and profile['email'] and
+        profile['mobile_phone'] and profile['city'],
+        # Professional profile
+        profile['professional_summary'],
+        # Work experience, education, skills
+        profile['has_work'],
+        profile['has_education'],
+        profile['has_skills'],
+        # At least one additional section
+        profile['has_additional'],
+        # References
+        profile['has_references'],
+        # Contact details complete
+        profile['address_line_1'] and profile['state_region'] and
+        profile['country'] and profile['postal_code'],
+    )
+    completed_sections = sum(1 for section in sections if section)
     
     percentage = int((completed_sections / total_sections) * 100)
     
-    # Update profile
-    profile.profile_completion_percentage = percentage
-    profile.save()
+    # Update profile - just the one column
+    UserProfile.objects.filter(id=profile_id).update(profile_completion_percentage=percentage)
     
     return JsonResponse({
         'percentage': percentage,